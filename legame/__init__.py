@@ -22,6 +22,7 @@ Modules which aid in creating 2-dimensional games with pygame.
 """
 import math
 from pygame.math import Vector2 as Vector
+from legame.kinematics import stopping_distance
 
 __version__ = "1.0.3"
 
@@ -224,19 +225,18 @@ def compass_str(const):
 
 def triangular(value, reduction):
 	"""
-	Returns the number of times the "reduction" parameter must be applied to the
-	"value" parameter for the value to reach zero.
+	Returns the sum of the series (value + reduction), value, (value - reduction)
+	... down to the first term which is no more than "reduction", which is counted
+	as "reduction".
 
-	For example, "triangular(speed, deceleration)" will tell you how many frames it
-	will take to decelerate from "speed" to zero, where "speed" and "deceleration"
-	are measures of distance of travel in pixels per frame.
-	"""
-	return _inner_triangular(value + reduction, reduction)
+	For example, "triangular(speed, deceleration)" will tell you how far it will
+	travel while decelerating from "speed" to zero, where "speed" and
+	"deceleration" are measures of distance of travel in pixels per frame.
 
-def _inner_triangular(remainder, reduction):
-	if remainder <= reduction:
-		return reduction
-	return remainder + _inner_triangular(remainder - reduction, reduction)
+	The same as kinematics.stopping_distance(), which is calculated in constant
+	time; see that module.
+	"""
+	return stopping_distance(value, reduction)
 
 def vint(vector):
 	"""
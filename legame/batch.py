@@ -0,0 +1,149 @@
+#  legame/batch.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Runs many copies of a Game headless, in a pool of processes, each for a fixed
+number of frames, and collects metrics from each run.
+
+Each run may have its own random seed and its own game attributes. When a run is
+finished, the game's "metrics()" function, if it has one, is called, and the
+dict it returns is included in the results. i.e.:
+
+	class HerdDemo(Game):
+		...
+		def metrics(self):
+			return { "foragers": sum(isinstance(sprite, Forager) for sprite in self.sprites) }
+
+From the command line, name the game class as in the benchmark module, i.e.:
+
+	python -m legame.batch legame/examples/herd.py:HerdDemo --runs 100 --frames 2000 \
+		--set num_predators=10 --output results.json
+
+Every run uses a different seed, counting up from "--seed".
+
+Runs are not throttled, and every frame counts as exactly one frame's time,
+including for timers set using "set_timeout()", so the same seed and attributes
+give the same metrics however fast or busy the computer is.
+"""
+import sys, json, logging, ast
+from multiprocessing import Pool
+from time import perf_counter
+import pygame
+from legame.benchmark import load_game_class, headless_game
+
+
+def run_one(job):
+	"""
+	Runs a single simulation. "job" is a tuple of (game, frames, seed, attributes),
+	where "game" is a Game class, or a "<module>:<class>" string as accepted by
+	benchmark.load_game_class(). Called in the worker processes by "run_batch()".
+
+	Returns a dict with the keys:
+
+		seed			the random seed used
+		attributes		the game attributes set for this run
+		frames			the number of frames run
+		seconds			the time taken to run the frames
+		metrics			the dict returned by the game's "metrics()" function, or {}
+	"""
+	game_class, frames, seed, attributes = job
+	if isinstance(game_class, str):
+		game_class = load_game_class(game_class)
+	game = headless_game(game_class, frames, random_seed = seed, **attributes)
+	start = perf_counter()
+	game.step(frames)
+	seconds = perf_counter() - start
+	metrics = game.metrics() if hasattr(game, "metrics") else {}
+	pygame.quit()
+	return {
+		"seed"			: seed,
+		"attributes"	: attributes,
+		"frames"		: game.frame_count,
+		"seconds"		: seconds,
+		"metrics"		: metrics
+	}
+
+
+def run_batch(game, runs, frames = 1000, processes = None):
+	"""
+	Runs the given game once for each of the "runs" given, spread across a pool of
+	"processes" processes, (by default, one per CPU), and returns a list of the
+	results of "run_one()", in the same order as "runs".
+
+	"game" is a Game class, or a "<module>:<class>" string. Games loaded from a file
+	(i.e. the examples) must be given as a string, so that each process can load it.
+
+	"runs" is a list of dicts, each of which may contain a "seed", and any other
+	items are set as attributes of the game for that run. An integer may be given
+	instead, to do that many runs, seeded 0, 1, 2 ...
+	"""
+	if isinstance(runs, int):
+		runs = [ { "seed": seed } for seed in range(runs) ]
+	jobs = []
+	for run in runs:
+		attributes = dict(run)
+		seed = attributes.pop("seed", None)
+		jobs.append((game, frames, seed, attributes))
+	with Pool(processes) as pool:
+		return pool.map(run_one, jobs, chunksize = 1)
+
+
+def main():
+	import argparse
+	p = argparse.ArgumentParser()
+	p.epilog = __doc__
+	p.formatter_class = argparse.RawDescriptionHelpFormatter
+	p.add_argument("game", type = str, help = 'The game class to run, as "<module>:<class>" or "<file.py>:<class>"')
+	p.add_argument("--runs", "-r", type = int, default = 10, help = "Number of simulations to run")
+	p.add_argument("--frames", "-n", type = int, default = 1000, help = "Number of frames to run each simulation for")
+	p.add_argument("--seed", "-s", type = int, default = 0, help = "Random seed of the first run")
+	p.add_argument("--processes", "-p", type = int, help = "Number of processes to use; defaults to the number of CPUs")
+	p.add_argument("--set", action = "append", default = [], metavar = "NAME=VALUE",
+		help = "Set a game attribute for every run; VALUE is a Python literal")
+	p.add_argument("--output", "-o", type = str, help = "JSON file to write the results to")
+	p.add_argument("--verbose", "-v", action = "store_true", help = "Show more detailed debug information")
+	options = p.parse_args()
+	logging.basicConfig(
+		level = logging.DEBUG if options.verbose else logging.ERROR,
+		format = "[%(filename)24s:%(lineno)-4d] %(message)s"
+	)
+
+	attributes = {}
+	for setting in options.set:
+		name, sep, value = setting.partition("=")
+		if not sep:
+			p.error('--set must be given as NAME=VALUE, not "%s"' % setting)
+		attributes[name] = ast.literal_eval(value)
+	runs = [ dict(attributes, seed = seed) for seed in range(options.seed, options.seed + options.runs) ]
+	start = perf_counter()
+	results = run_batch(options.game, runs, options.frames, options.processes)
+	print("%d runs of %d frames in %.3f seconds" % (len(results), options.frames, perf_counter() - start))
+	for result in results:
+		print("seed %-6s %s" % (result["seed"], json.dumps(result["metrics"])))
+	if options.output:
+		with open(options.output, "w") as fh:
+			json.dump(results, fh, indent = "\t")
+	return 0
+
+
+if __name__ == '__main__':
+	sys.exit(main())
+
+
+#  end legame/batch.py
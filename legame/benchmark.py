@@ -0,0 +1,171 @@
+#  legame/benchmark.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Runs a Game headless, (no window, no sound), for a fixed number of frames as
+fast as possible, and reports the frame rate achieved.
+
+From the command line, name the game class as "<module>:<class>" or
+"<file.py>:<class>", i.e.:
+
+	python -m legame.benchmark legame/examples/herd.py:HerdDemo --frames 2000
+
+Results can be saved to, and compared with, a baseline file:
+
+	python -m legame.benchmark mygame:MyGame --baseline perf.json --save
+	python -m legame.benchmark mygame:MyGame --baseline perf.json --tolerance 0.1
+
+When comparing, the exit status is 1 if the frame rate is lower than the
+baseline by more than the given tolerance.
+
+A play session recorded using the Game "record_file" option may be replayed,
+so that the benchmark exercises the game the way a real player did:
+
+	python -m legame.benchmark mygame:MyGame --replay session.replay
+"""
+import os, sys, json, logging, importlib, importlib.util
+from random import seed as random_seed
+from time import perf_counter
+import pygame
+
+
+def load_game_class(spec):
+	"""
+	Returns the class named by "spec", which must be in the form "<module>:<class>",
+	or "<path to file.py>:<class>". Loading from a file allows for the examples,
+	whose filenames are not valid module names.
+	"""
+	module_name, sep, class_name = spec.rpartition(":")
+	if not sep or not module_name or not class_name:
+		raise ValueError('Game class must be given as "<module>:<class>", not "%s"' % spec)
+	if module_name.endswith(".py"):
+		name = os.path.splitext(os.path.basename(module_name))[0].replace("-", "_")
+		module_spec = importlib.util.spec_from_file_location(name, module_name)
+		module = importlib.util.module_from_spec(module_spec)
+		module_spec.loader.exec_module(module)
+	else:
+		module = importlib.import_module(module_name)
+	return getattr(module, class_name)
+
+
+def headless_game(game_class, frames, **attributes):
+	"""
+	Returns an instance of a subclass of "game_class" which runs headless, without
+	limiting the frame rate, and exits after "frames" frames. Any "attributes"
+	given are set on the subclass, so that they are in place when the Game is
+	constructed.
+
+	The game class must be constructable without arguments.
+	"""
+	attributes.update(headless = True, limit_fps = False, max_frames = frames)
+	return type(game_class.__name__, (game_class,), attributes)()
+
+
+def benchmark(game_class, frames = 1000, seed = None, **attributes):
+	"""
+	Runs the given Game class headless for "frames" frames, and returns a dict
+	with the keys:
+
+		game		the name of the game class
+		frames		the number of frames run
+		seconds		the time spent in the main loop
+		fps			frames per second
+
+	Startup, (initializing pygame, showing the game and entering the initial state),
+	is not included in the time.
+
+	If "seed" is given, the random number generator is seeded with it before the
+	game is constructed, for repeatable runs.
+	"""
+	if seed is not None:
+		random_seed(seed)
+	game = headless_game(game_class, frames, **attributes)
+	game.show()
+	game._enter_initial_state()
+	start = perf_counter()
+	game._main_loop()
+	seconds = perf_counter() - start
+	pygame.quit()
+	return {
+		"game"		: game_class.__name__,
+		"frames"	: game.frame_count,
+		"seconds"	: seconds,
+		"fps"		: game.frame_count / seconds if seconds else 0.0
+	}
+
+
+def compare(result, baseline, tolerance = 0.1):
+	"""
+	Compares a "benchmark()" result with a baseline result for the same game.
+	Returns a tuple of (ratio, passed), where "ratio" is the frame rate relative to
+	the baseline, and "passed" is False if the frame rate dropped by more than
+	"tolerance", (a fraction of the baseline frame rate).
+	"""
+	ratio = result["fps"] / baseline["fps"]
+	return ratio, ratio >= 1.0 - tolerance
+
+
+def main():
+	import argparse
+	p = argparse.ArgumentParser()
+	p.epilog = __doc__
+	p.formatter_class = argparse.RawDescriptionHelpFormatter
+	p.add_argument("game", type = str, help = 'The game class to run, as "<module>:<class>" or "<file.py>:<class>"')
+	p.add_argument("--frames", "-n", type = int, default = 1000, help = "Number of frames to run")
+	p.add_argument("--seed", "-s", type = int, help = "Random seed, for repeatable runs")
+	p.add_argument("--replay", "-r", type = str, help = "Recorded session to replay; see legame.replay")
+	p.add_argument("--baseline", "-b", type = str, help = "JSON file of baseline results to compare with")
+	p.add_argument("--save", action = "store_true", help = "Save the result to the baseline file instead of comparing")
+	p.add_argument("--tolerance", "-t", type = float, default = 0.1, help = "Allowed drop in fps, as a fraction of the baseline")
+	p.add_argument("--verbose", "-v", action = "store_true", help = "Show more detailed debug information")
+	options = p.parse_args()
+	logging.basicConfig(
+		level = logging.DEBUG if options.verbose else logging.ERROR,
+		format = "[%(filename)24s:%(lineno)-4d] %(message)s"
+	)
+
+	attributes = {} if options.replay is None else { "replay_file": options.replay }
+	result = benchmark(load_game_class(options.game), options.frames, options.seed, **attributes)
+	print("%s: %d frames in %.3f seconds, %.1f fps" % \
+		(result["game"], result["frames"], result["seconds"], result["fps"]))
+	if options.baseline is None:
+		return 0
+	baselines = {}
+	if os.path.isfile(options.baseline):
+		with open(options.baseline) as fh:
+			baselines = json.load(fh)
+	if options.save:
+		baselines[result["game"]] = result
+		with open(options.baseline, "w") as fh:
+			json.dump(baselines, fh, indent = "\t")
+		return 0
+	if result["game"] not in baselines:
+		logging.error("No baseline for %s in %s", result["game"], options.baseline)
+		return 2
+	ratio, passed = compare(result, baselines[result["game"]], options.tolerance)
+	print("%.1f%% of baseline (%.1f fps)%s" % \
+		(ratio * 100, baselines[result["game"]]["fps"], "" if passed else " - REGRESSION"))
+	return 0 if passed else 1
+
+
+if __name__ == '__main__':
+	sys.exit(main())
+
+
+#  end legame/benchmark.py
@@ -30,6 +30,7 @@ from pygame.sprite import Sprite
 from pygame.math import Vector2 as Vector
 from legame.game import Game, GameState
 from legame.sprite_enhancement import MovingSprite
+from legame.sprite_groups import sleep
 
 
 class BoardGame(Game):
@@ -119,9 +120,10 @@ class GameBoard:
 		else:
 			raise ValueError("Board.cell_at() takes two numbers or a tuple of two numbers")
 		return Cell(
-			floor((x - Game.current.board.left) / Game.current.board.cell_width),
-			floor((y - Game.current.board.top) / Game.current.board.cell_height)
-		) if Game.current.board.rect.collidepoint(int(x), int(y)) else None
+			floor((x - self.left) / self.cell_width),
+			floor((y - self.top) / self.cell_height),
+			self
+		) if self.rect.collidepoint(int(x), int(y)) else None
 
 	def piece_at(self, cell):
 		"""
@@ -205,8 +207,20 @@ class GameBoard:
 
 class Cell:
 
-	def __init__(self, column, row):
+	def __init__(self, column, row, board = None):
+		"""
+		"board" is the GameBoard this Cell is on. When not given, the board of
+		Game.current is used.
+		"""
 		self.column, self.row = column, row
+		self._board = board
+
+	@property
+	def board(self):
+		"""
+		The GameBoard this Cell is on.
+		"""
+		return Game.current.board if self._board is None else self._board
 
 	def __iter__(self):
 		return iter((self.column, self.row))
@@ -218,50 +232,49 @@ class Cell:
 		"""
 		Places a reference to the given GamePiece in this cell.
 		"""
-		Game.current.board.set_cell(self, piece)
+		self.board.set_cell(self, piece)
 		return self
 
 	def clear(self):
 		"""
 		Kills the GamePiece at this cell, if one exists there.
 		"""
-		Game.current.board.clear_cell(self)
+		self.board.clear_cell(self)
 		return self
 
 	def piece(self):
 		"""
 		Returns the content of the GameBoard at this cell
 		"""
-		return Game.current.board.piece_at(self)
+		return self.board.piece_at(self)
 
 	def is_mine(self):
 		"""
 		Returns True if there is a GamePiece at this cell which has this player's "color".
 		"""
-		return Game.current.board.is_mine(self)
+		return self.board.is_mine(self)
 
 	def is_opponents(self):
 		"""
 		Returns True if there is a GamePiece at this cell, and it doesn't have this
 		player's "color".
 		"""
-		return Game.current.board.is_opponents(self)
+		return self.board.is_opponents(self)
 
 	def is_empty(self):
 		"""
 		Returns True if this cell is empty.
 		"""
-		return Game.current.board.is_empty(self)
+		return self.board.is_empty(self)
 
 	def center(self):
 		"""
 		Returns the center point of this position.
 		"""
+		board = self.board
 		return (
-			Game.current.board.left + Game.current.board.cell_width * self.column \
-				+ Game.current.board.cell_half_width,
-			Game.current.board.top + Game.current.board.cell_height * self.row \
-				+ Game.current.board.cell_half_height
+			board.left + board.cell_width * self.column + board.cell_half_width,
+			board.top + board.cell_height * self.row + board.cell_half_height
 		)
 
 	def rect(self):
@@ -269,18 +282,19 @@ class Cell:
 		Returns a pygame rect which covers this position.
 		Top-left is the top-left of the cell.
 		"""
+		board = self.board
 		return Rect(
-			Game.current.board.left + Game.current.board.cell_width * self.column,
-			Game.current.board.top + Game.current.board.cell_height * self.row,
-			Game.current.board.cell_width,
-			Game.current.board.cell_height
+			board.left + board.cell_width * self.column,
+			board.top + board.cell_height * self.row,
+			board.cell_width,
+			board.cell_height
 		)
 
 	def copy(self):
 		"""
 		Returns a copy.
 		"""
-		return Cell(self.column, self.row)
+		return Cell(self.column, self.row, self._board)
 
 	def shifted(self, columns = None, rows = None):
 		"""
@@ -289,7 +303,8 @@ class Cell:
 		"""
 		return Cell(
 			self.column if columns is None else self.column + columns,
-			self.row if rows is None else self.row + rows
+			self.row if rows is None else self.row + rows,
+			self._board
 		)
 
 	def moved(self, column = None, row = None):
@@ -300,7 +315,8 @@ class Cell:
 		"""
 		return Cell(
 			self.column if column is None else column,
-			self.row if row is None else row
+			self.row if row is None else row,
+			self._board
 		)
 
 	def __str__(self):
@@ -315,12 +331,17 @@ class Statusbar(Sprite):
 	foreground_color	= (250,250,160)
 	background_color	= (0,0,12)
 
-	def __init__(self):
-		Sprite.__init__(self, Game.current.sprites)
-		Game.current.sprites.change_layer(self, Game.LAYER_ABOVE_BG)
+	def __init__(self, game = None):
+		"""
+		"game" is the BoardGame to show this Statusbar in. When not given,
+		Game.current is used.
+		"""
+		game = Game.current if game is None else game
+		Sprite.__init__(self, game.sprites)
+		game.sprites.change_layer(self, Game.LAYER_ABOVE_BG)
 		self.font = SysFont(self.font, 22)
 		self.image = Surface((
-			Game.current.board.rect.width,
+			game.board.rect.width,
 			self.font.get_linesize() + self.padding * 2
 		))
 		self.text = ""
@@ -345,6 +366,7 @@ class Statusbar(Sprite):
 			self.font.render(self.text, True, self.foreground_color),
 			(self.padding, self.padding)
 		)
+		self.dirty = True	# Image changed in place; see sprite_groups.DirtyUpdates
 
 
 class BoardGameState(GameState):
@@ -354,11 +376,11 @@ class BoardGameState(GameState):
 
 	def __init__(self, **kwargs):
 		"""
-		BoardGameState constructor - sets the current mouse position passes execution
-		to GameState constructor.
+		BoardGameState constructor - passes execution to GameState constructor, then
+		sets the current mouse position.
 		"""
-		self.mouse_pos = Game.current.board.cell_at(mouse.get_pos())
 		GameState.__init__(self, **kwargs)
+		self.mouse_pos = self.game.board.cell_at(mouse.get_pos())
 
 	def loop_end(self):
 		"""
@@ -375,7 +397,7 @@ class BoardGameState(GameState):
 		Mouse move event passed to this GameState.
 		event will contain:	pos, rel, buttons
 		"""
-		cell = Game.current.board.cell_at(event.pos)
+		cell = self.game.board.cell_at(event.pos)
 		if cell is None:
 			return
 		if self.mouse_pos is not None \
@@ -426,6 +448,8 @@ class AbstractGamePiece:
 	An "abstract" version of a GamePiece, used for testing and assertions
 	"""
 
+	sleep_when_idle	= True		# Stop updating this piece while it is not moving or flipping
+
 	def __init__(self, cell, color):
 		self.cell = cell
 		self.color = color
@@ -462,6 +486,7 @@ class AbstractGamePiece:
 				current_resident.kill()
 			Game.current.board.set_cell(self.cell, self)
 			self._motion_function = self.no_motion
+			self.sleep_if_idle()
 			if callable(on_arrival):
 				on_arrival()
 		if target_cell is None:
@@ -480,6 +505,24 @@ class AbstractGamePiece:
 			Game.current.board.clear_cell(self.cell)
 			return self.travel_to(self.target_cell.center(), arrival_function)
 
+	def is_idle(self):
+		"""
+		Returns True when this piece is neither travelling to a cell nor flipping
+		through images.
+		"""
+		travelling = getattr(self, "destination", None) is not None \
+			and self._motion_function != self.no_motion
+		return not travelling and getattr(self, "flipper", None) is None
+
+	def sleep_if_idle(self):
+		"""
+		Puts this piece to sleep when "sleep_when_idle" is set and it is idle. Called
+		when constructed, on arrival at a cell, and by Flipper when the last FlipEffect
+		is done. The piece is woken by "travel_to()" and Flipper.flip().
+		"""
+		if self.sleep_when_idle and self.is_idle():
+			sleep(self)
+
 	def travel_to(self, coords, on_arrival):
 		"""
 		High-level command which sets a MovingSprite on a path towards a given target.
@@ -501,6 +544,7 @@ class GamePiece(MovingSprite, Sprite, AbstractGamePiece):
 		self.image_set = Game.current.resources.image_set(f"{self.__class__.__name__}/{self.color}")
 		Sprite.__init__(self, Game.current.sprites)
 		Game.current.sprites.change_layer(self, Game.LAYER_PLAYER)
+		self.sleep_if_idle()
 
 
 #  end legame/board_game.py
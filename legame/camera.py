@@ -0,0 +1,173 @@
+#  legame/camera.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the Camera class, a view onto a world which is larger than the screen,
+and the CameraUpdates sprite group which draws only the sprites the Camera sees.
+"""
+from pygame import Rect
+from legame.sprite_groups import SleepingUpdates
+
+
+class Camera:
+	"""
+	A window onto a "world" which may be much larger than the screen.
+
+	When the Game has a "world_rect", it creates a Camera as "Game.camera", and
+	uses a CameraUpdates group for its sprites. Sprites are positioned in world
+	coordinates, and the Camera decides which part of the world is shown on the
+	screen. Sprites outside of the Camera's view are not drawn at all, but are
+	otherwise unaffected; they keep moving and keep their world position.
+
+	Events such as mouse clicks give screen coordinates. Use "to_world()" to find
+	the position in the world which was clicked.
+	"""
+
+	def __init__(self, world_rect, size = (0, 0)):
+		"""
+		"world_rect" is a pygame Rect covering the whole world, in world coordinates.
+		"size" is the size of the view, which is normally the size of the screen.
+		"""
+		self.world_rect = Rect(world_rect)
+		self.rect = Rect(self.world_rect.topleft, size)	# The part of the world in view
+		self.target = None
+
+	def resize(self, size):
+		"""
+		Sets the size of the view, keeping it centered on the same point.
+		"""
+		center = self.rect.center
+		self.rect.size = size
+		self.look_at(center)
+
+	def look_at(self, position):
+		"""
+		Centers the view on the given position in the world, (x, y tuple or Vector),
+		without showing anything outside of the world.
+		"""
+		self.rect.center = (int(position[0]), int(position[1]))
+		self.rect.clamp_ip(self.world_rect)
+
+	def follow(self, target):
+		"""
+		Keeps the view centered on the given target, which must have a "position"
+		attribute, (i.e. a CenteredSprite). Pass None to stop following.
+		"""
+		self.target = target
+
+	def update(self):
+		"""
+		Called by CameraUpdates once per frame, before drawing.
+		Moves the view to the target being followed, if any.
+		"""
+		if self.target is not None:
+			self.look_at(self.target.position)
+
+	def to_screen(self, position):
+		"""
+		Returns the screen coordinates (x, y tuple) of the given world position.
+		"""
+		return position[0] - self.rect.x, position[1] - self.rect.y
+
+	def to_world(self, position):
+		"""
+		Returns the world coordinates (x, y tuple) of the given screen position.
+		"""
+		return position[0] + self.rect.x, position[1] + self.rect.y
+
+	def sees(self, rect):
+		"""
+		Returns True if any part of the given Rect (in world coordinates) is in view.
+		"""
+		return self.rect.colliderect(rect)
+
+
+class CameraUpdates(SleepingUpdates):
+	"""
+	A SleepingUpdates group which draws sprites through a Camera.
+
+	Sprite rects are in world coordinates. Sprites whose rect is not in view of the
+	Camera are skipped, (culled). Sprites which are in view are drawn offset by the
+	position of the Camera.
+
+	Sprites in the layers listed in "screen_layers" are drawn in screen
+	coordinates, ignoring the Camera. Use these layers for status bars and the
+	like. The Game creates its CameraUpdates with only Game.LAYER_OVERLAY.
+
+	The background is drawn in screen coordinates, and does not scroll. Whenever
+	the Camera moves, the whole screen is cleared and redrawn.
+	"""
+
+	screen_layers		= ()		# Layers drawn in screen coordinates
+
+	def __init__(self, camera, *sprites, screen_layers = None, **kwargs):
+		"""
+		"camera" is the Camera to draw through. "screen_layers", when given, replaces
+		the class default.
+		"""
+		SleepingUpdates.__init__(self, *sprites, **kwargs)
+		self.camera = camera
+		if screen_layers is not None:
+			self.screen_layers = tuple(screen_layers)
+		self._drawn = []			# Screen rects drawn on the last frame
+		self._offset = None			# Camera position on the last frame
+		self._moved = True
+
+	def clear(self, surface, bgd):
+		"""
+		Updates the Camera and erases the sprites drawn on the last frame. If the
+		Camera moved, erases the whole surface.
+		"""
+		self.camera.update()
+		offset = self.camera.rect.topleft
+		self._moved = offset != self._offset
+		self._offset = offset
+		if self._moved:
+			surface.blit(bgd, (0, 0))
+		else:
+			for rect in self._drawn:
+				surface.blit(bgd, rect, rect)
+
+	def draw(self, surface, bgsurf = None, special_flags = 0):
+		"""
+		Draws the sprites in view of the Camera. Returns a list of the areas of the
+		surface which need to be updated on the display.
+		"""
+		view = self.camera.rect
+		x, y = view.topleft
+		screen_layers = self.screen_layers
+		layers = self._spritelayers
+		blit = surface.blit
+		drawn = []
+		for sprite in self.sprites():
+			rect = sprite.rect
+			if layers[sprite] in screen_layers:
+				drawn.append(blit(sprite.image, rect, None, special_flags))
+			elif view.colliderect(rect):
+				drawn.append(blit(sprite.image, (rect.x - x, rect.y - y), None, special_flags))
+		if self._moved:
+			dirty = [surface.get_rect()]
+		else:
+			dirty = self._drawn + drawn
+		self._drawn = drawn
+		self.lostsprites = []
+		return dirty
+
+
+#  end legame/camera.py
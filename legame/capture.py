@@ -0,0 +1,260 @@
+#  legame/capture.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the FrameCapture class, which keeps copies of the last few seconds of
+frames drawn by the Game, and writes them to disk on a background thread.
+
+Saving a screenshot using pygame.image.save() takes far longer than a frame, so
+saving every frame that way slows a game to a crawl. FrameCapture only copies
+the parts of the screen which changed each frame, (a fast blit), and leaves the
+encoding to a worker thread.
+
+The Game creates a FrameCapture when its "capture_seconds" option is set. Press
+"capture_key" to save an "instant replay" of the frames in the buffer.
+
+Frames are written either as a sequence of PNG images, ("png" format), or as a
+single file of raw RGB pixels, ("raw" format), which can be converted to video
+using ffmpeg, i.e.:
+
+	ffmpeg -f rawvideo -pixel_format rgb24 -video_size 800x600 -framerate 60 \\
+		-i captures/20250101-120000/frames.rgb replay.mp4
+"""
+import os, logging
+from collections import deque
+from queue import Queue, Full
+from threading import Thread
+from time import strftime
+import pygame
+
+
+class FrameCapture:
+	"""
+	A ring buffer of the last "length" frames captured, and a worker thread which
+	writes frames to disk.
+
+	Each frame is kept as a list of (Rect, Surface) pieces; the parts of the screen
+	which changed. To rebuild whole frames, a copy of the screen as it was before
+	the oldest frame in the buffer is kept, and updated as frames fall off the end
+	of the buffer.
+
+	Call "dump()" to save the frames in the buffer, or "start()" and "stop()" to
+	save every frame captured in between.
+	"""
+
+	max_queued			= 120		# Frames waiting to be written before frames are dropped
+
+	def __init__(self, directory = "captures", length = 600, format = "png"):
+		"""
+		"directory" is where captures are saved. Each is saved in a subdirectory named
+		for the time it was saved.
+		"length" is the number of frames kept in the buffer.
+		"format" is "png", for a sequence of images, or "raw", for one file of RGB pixels.
+		"""
+		if format not in ("png", "raw"):
+			raise ValueError('Capture format must be "png" or "raw", not "%s"' % format)
+		self.directory = directory
+		self.format = format
+		self.frames = deque(maxlen = length)
+		self.dropped = 0				# Number of frames dropped because the writer fell behind
+		self._base = None				# Screen as it was before the oldest frame in "frames"
+		self._stream = None				# _Writer which every frame is sent to, when started
+		self._stream_started = False	# True once the first (whole) frame is sent to "_stream"
+		self._queue = Queue(self.max_queued)
+		self._thread = None
+		self._directories = set()		# Directories used, which may not be created yet
+
+	def __len__(self):
+		"""
+		Returns the number of frames in the buffer.
+		"""
+		return len(self.frames)
+
+	def capture(self, surface, rects = None):
+		"""
+		Adds a frame to the buffer. "rects" is a list of the areas of "surface" which
+		changed since the last frame captured, (i.e. as returned by a sprite group's
+		"draw()" function), or None if all of "surface" changed.
+		"""
+		if rects is None or not self.frames:
+			pieces = [(surface.get_rect(), surface.copy())]
+		else:
+			bounds = surface.get_rect()
+			pieces = []
+			for rect in rects:
+				rect = bounds.clip(rect)
+				if rect:
+					pieces.append((rect, surface.subsurface(rect).copy()))
+		frames = self.frames
+		if len(frames) == frames.maxlen:
+			self._base = _apply(self._base, frames[0])
+		frames.append(pieces)
+		if self._stream is not None:
+			if not self._stream_started:
+				pieces = [(surface.get_rect(), surface.copy())]
+				self._stream_started = True
+			try:
+				self._queue.put_nowait((self._stream, [pieces]))
+			except Full:
+				self.dropped += 1
+				if self.dropped == 1:
+					logging.warning("Frame capture is falling behind; dropping frames")
+
+	def dump(self, directory = None):
+		"""
+		Writes all of the frames in the buffer, in the background. Returns the
+		directory they are written to. When not given, a new subdirectory of
+		"self.directory" is used.
+		"""
+		directory = directory or self._new_directory()
+		base = None if self._base is None else self._base.copy()
+		self._put((_Writer(directory, self.format, base), list(self.frames)))
+		self._put((None, directory))
+		logging.debug("Dumping %d frames to %s", len(self.frames), directory)
+		return directory
+
+	def start(self, directory = None):
+		"""
+		Starts writing every frame captured, until "stop()" is called. Returns the
+		directory they are written to.
+		"""
+		self.stop()
+		self._start_thread()
+		directory = directory or self._new_directory()
+		self._stream = _Writer(directory, self.format, None)
+		self._stream_started = False
+		return directory
+
+	def stop(self):
+		"""
+		Stops writing every frame captured, if started.
+		"""
+		if self._stream is not None:
+			self._put((None, self._stream.directory))
+			self._stream = None
+
+	def close(self):
+		"""
+		Stops writing, and waits for everything queued to be written.
+		"""
+		self.stop()
+		if self._thread is not None:
+			self._queue.put(None)
+			self._thread.join()
+			self._thread = None
+
+	def _start_thread(self):
+		"""
+		Starts the worker thread, if not already started.
+		"""
+		if self._thread is None:
+			self._thread = Thread(target = self._work, name = "FrameCapture", daemon = True)
+			self._thread.start()
+
+	def _put(self, job):
+		"""
+		Queues a job for the worker thread, starting it if necessary.
+		"""
+		self._start_thread()
+		self._queue.put(job)
+
+	def _work(self):
+		"""
+		Runs in the worker thread. Writes frames until None is taken from the queue.
+		"""
+		writers = {}
+		while True:
+			job = self._queue.get()
+			if job is None:
+				break
+			writer, frames = job
+			try:
+				if writer is None:
+					writer = writers.pop(frames, None)
+					if writer is not None:
+						writer.close()
+				else:
+					writers[writer.directory] = writer
+					for pieces in frames:
+						writer.write(pieces)
+			except Exception as e:
+				logging.error("Frame capture failed: %s", e)
+		for writer in writers.values():
+			writer.close()
+
+	def _new_directory(self):
+		"""
+		Returns the name of a directory under "self.directory" which does not yet exist.
+		"""
+		name = os.path.join(self.directory, strftime("%Y%m%d-%H%M%S"))
+		directory, number = name, 1
+		while directory in self._directories or os.path.exists(directory):
+			number += 1
+			directory = "%s-%d" % (name, number)
+		self._directories.add(directory)
+		return directory
+
+
+class _Writer:
+	"""
+	Rebuilds whole frames from their pieces and writes them to one directory.
+	Only used from the FrameCapture worker thread.
+	"""
+
+	def __init__(self, directory, format, base):
+		self.directory = directory
+		self.format = format
+		self.canvas = base
+		self.count = 0
+		self._file = None
+
+	def write(self, pieces):
+		if self.count == 0:
+			os.makedirs(self.directory, exist_ok = True)
+		self.canvas = _apply(self.canvas, pieces)
+		if self.format == "png":
+			pygame.image.save(self.canvas, os.path.join(self.directory, "frame%05d.png" % self.count))
+		else:
+			if self._file is None:
+				self._file = open(os.path.join(self.directory, "frames.rgb"), "wb")
+			self._file.write(pygame.image.tobytes(self.canvas, "RGB"))
+		self.count += 1
+
+	def close(self):
+		if self._file is not None:
+			self._file.close()
+			self._file = None
+		if self.count:
+			logging.debug("Wrote %d frames (%dx%d) to %s", self.count,
+				*self.canvas.get_size(), self.directory)
+
+
+def _apply(canvas, pieces):
+	"""
+	Draws the pieces of a frame onto "canvas" and returns it. If "canvas" is None,
+	a new Surface is created, the size of the first piece.
+	"""
+	if canvas is None:
+		canvas = pygame.Surface(pieces[0][0].size)
+	for rect, image in pieces:
+		canvas.blit(image, rect)
+	return canvas
+
+
+#  end legame/capture.py
@@ -0,0 +1,101 @@
+#  legame/examples/compact-sprites.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Compares the memory used by, and the speed of, MovingSprite and
+CompactMovingSprite, both on their own and combined with pygame's Sprite.
+
+For each number of sprites, shows the bytes used per sprite, and the time taken
+per sprite by "update()", while moving in a straight line, ("cartesian"), and
+while seeking a destination, ("seek"). i.e.:
+
+	python legame/examples/compact-sprites.py --counts 10000,100000,1000000
+"""
+import argparse, gc, tracemalloc
+from random import seed, uniform
+from time import perf_counter
+from pygame.sprite import Sprite
+from legame.sprite_enhancement import MovingSprite, CompactMovingSprite
+
+
+class PlainThing(MovingSprite):
+	pass
+
+
+class CompactThing(CompactMovingSprite):
+	__slots__ = ()
+
+
+class PlainSprite(MovingSprite, Sprite):
+	def __init__(self, x, y, speed, direction):
+		MovingSprite.__init__(self, x, y, speed, direction)
+		Sprite.__init__(self)
+
+
+class CompactSprite(CompactMovingSprite, Sprite):
+	def __init__(self, x, y, speed, direction):
+		CompactMovingSprite.__init__(self, x, y, speed, direction)
+		Sprite.__init__(self)
+
+
+def measure(sprite_class, count, frames):
+	"""
+	Returns (bytes per sprite, nanoseconds per update() moving in a straight line,
+	nanoseconds per update() seeking) for "count" sprites of the given class.
+	"""
+	gc.collect()
+	tracemalloc.start()
+	sprites = [ sprite_class(uniform(0, 800), uniform(0, 600), 2.0, uniform(-180, 180)) \
+		for n in range(count) ]
+	size = tracemalloc.get_traced_memory()[0] / count
+	tracemalloc.stop()
+	start = perf_counter()
+	for frame in range(frames):
+		for sprite in sprites:
+			sprite.update()
+	cartesian = (perf_counter() - start) / (frames * count) * 1e9
+	for sprite in sprites:
+		sprite.travel_to((10000.0, 10000.0))
+	start = perf_counter()
+	for frame in range(frames):
+		for sprite in sprites:
+			sprite.update()
+	seek = (perf_counter() - start) / (frames * count) * 1e9
+	del sprites
+	return size, cartesian, seek
+
+
+if __name__ == '__main__':
+	p = argparse.ArgumentParser()
+	p.add_argument("--counts", type = str, default = "10000,100000,1000000",
+		help = "Comma-separated numbers of sprites to create")
+	p.add_argument("--frames", "-n", type = int, default = 5,
+		help = "Number of times to move every sprite")
+	p.epilog = __doc__
+	p.formatter_class = argparse.RawDescriptionHelpFormatter
+	options = p.parse_args()
+	seed(0)
+	print("%-14s %9s %10s %14s %10s" % ("class", "sprites", "bytes", "cartesian ns", "seek ns"))
+	for count in [ int(count) for count in options.counts.split(",") ]:
+		for sprite_class in (PlainThing, CompactThing, PlainSprite, CompactSprite):
+			size, cartesian, seek = measure(sprite_class, count, options.frames)
+			print("%-14s %9d %10.1f %14.1f %10.1f" % (sprite_class.__name__, count, size, cartesian, seek))
+
+
+#  end legame/examples/compact-sprites.py
@@ -79,7 +79,16 @@ class HerdDemo(Game, Neighborhood):
 
 	def _end_loop(self):
 		neighborhood.notify_sprites()
-		self._state.loop_end()
+		return self._state.loop_end()
+
+	def metrics(self):
+		"""
+		Called by legame.batch at the end of a simulation run.
+		"""
+		return {
+			"foragers"	: sum(isinstance(sprite, Forager) for sprite in self.sprites),
+			"predators"	: sum(isinstance(sprite, Predator) for sprite in self.sprites)
+		}
 
 
 class GSWatch(GameState):
@@ -33,6 +33,7 @@ except ImportError:
 from legame import vint
 from legame.game import Game, GameState
 from legame.sprite_enhancement import MovingSprite
+from legame.rotation import Rotating
 
 
 
@@ -95,7 +96,7 @@ class Mouse(MovingSprite, Sprite):
 		self.update_rect()
 
 
-class Chaser(MovingSprite, Sprite):
+class Chaser(Rotating, MovingSprite, Sprite):
 
 	height				= 24
 	width				= 24
@@ -114,13 +115,13 @@ class Chaser(MovingSprite, Sprite):
 			(-12, -10)
 		]
 		self.center_point = Vector(12, 12)
+		self.base_image = Surface(self.rect.size, SRCALPHA)
+		polygon(self.base_image, self.color, [vint(Vector(p) + self.center_point) for p in self.points])
 
 	def update(self):
 		self.turn_towards(self.target.position)
-		self.image = Surface(self.rect.size)
-		polygon(self.image, self.color, [vint(Vector(p).rotate(self.direction) + self.center_point) \
-			for p in self.points])
 		MovingSprite.update(self)
+		self.rotate_image()
 
 
 if __name__ == '__main__':
@@ -22,18 +22,21 @@ Provides classes which are used to do image cycling on a Sprite.
 """
 from collections import deque
 from legame.game import Game
+from legame.sprite_groups import wake
 
 
 class Flipper:
 
 	image_folder = None	# base name of this thing's image set. If none, use the class name
+	flip_interval = 1	# Only update the image every this many updates; see pacing.FramePacer
+	_flips_skipped = 0
 
 	@classmethod
 	def preload(cls, **kwargs):
 		for subclass in Flipper.__subclasses__():
 			Game.current.resources.image_set(subclass.__name__, **kwargs)
 
-	def __init__(self, *flippers, **kwargs):
+	def __init__(self, *flippers, game = None, **kwargs):
 		"""
 		Initialize the image set used by this Thing, set the current FlipEffect to the first
 		FlipEffect object given, and queue up any other FlipEffect given.
@@ -43,8 +46,12 @@ class Flipper:
 			Flipper.__init__(self, <flipper>, <flipper>, <flipper>)
 
 		See FlipEffect.__init__ for common image flipper options.
+
+		"game" is the Game whose resources the images are loaded from. When not given,
+		Game.current is used.
 		"""
-		self._base_image_set = Game.current.resources.image_set(
+		game = Game.current if game is None else game
+		self._base_image_set = game.resources.image_set(
 			self.__class__.__name__ if self.image_folder is None else self.image_folder,
 			**kwargs
 		)
@@ -89,19 +96,30 @@ class Flipper:
 		"""
 		if self.flipper is None:
 			return
+		if self.flip_interval > 1:
+			self._flips_skipped += 1
+			if self._flips_skipped < self.flip_interval:
+				return
+			self._flips_skipped = 0
 		self.image = self.flipper.update()
 		if self.flipper.done:
 			self.next_flipper()
 
 	def next_flipper(self):
 		"""
-		Advances to the next FlipEffect in the queue.
+		Advances to the next FlipEffect in the queue, waking this sprite if sleeping.
+		When the queue is empty, a sprite which has a "sleep_if_idle()" function,
+		(such as a GamePiece), is given the chance to go to sleep.
 		"""
 		if len(self._flipper_queue):
 			self.flipper = self._flipper_queue.popleft()
 			self.image = self.flipper.first_image()
+			wake(self)
 		else:
 			self.flipper = None
+			sleep_if_idle = getattr(self, "sleep_if_idle", None)
+			if sleep_if_idle is not None:
+				sleep_if_idle()
 
 
 class FlipEffect:
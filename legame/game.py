@@ -20,7 +20,12 @@
 """
 Provides the Game and GameState classes, a framework for writing games.
 """
-import os, logging
+import os, logging, random, asyncio
+from queue import SimpleQueue
+from contextlib import contextmanager
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+from time import monotonic
 import pygame
 try:
 	from pygame.locals import FULLSCREEN, SCALED, DOUBLEBUF, USEREVENT, NUMEVENTS
@@ -30,6 +35,81 @@ except ImportError:
 from pygame.event import event_name
 from pygame import Surface
 from legame.resources import Resources
+from legame.sprite_enhancement import BaseMovingSprite
+from legame.profiler import FrameProfiler
+from legame.timers import TimerQueue, new_handle
+from legame.replay import Recording
+from legame.sprite_groups import SleepingUpdates, DirtyUpdates
+from legame.hud import PerformanceHUD
+from legame.capture import FrameCapture
+from legame.pacing import FramePacer
+from legame.camera import Camera, CameraUpdates
+
+# Names of the GameState function called for each pygame event type, keyed on the
+# name of the event type constant. Each is called from a "Game._evt_<event type>"
+# function, i.e. "Game._evt_keydown" calls "GameState.key_down".
+STATE_HANDLERS = {
+	"ACTIVEEVENT":					"active_event",
+	"AUDIODEVICEADDED":				"audio_device_added",
+	"AUDIODEVICEREMOVED":			"audio_device_removed",
+	"CONTROLLERAXISMOTION":			"controller_axis_motion",
+	"CONTROLLERBUTTONDOWN":			"controller_button_down",
+	"CONTROLLERBUTTONUP":			"controller_button_up",
+	"CONTROLLERDEVICEADDED":		"controller_device_added",
+	"CONTROLLERDEVICEREMAPPED":		"controller_device_remapped",
+	"CONTROLLERDEVICEREMOVED":		"controller_device_removed",
+	"DROPBEGIN":					"drop_begin_event",
+	"DROPCOMPLETE":					"drop_complete_event",
+	"DROPFILE":						"drop_file_event",
+	"DROPTEXT":						"drop_text_event",
+	"FINGERDOWN":					"finger_down",
+	"FINGERMOTION":					"finger_motion",
+	"FINGERUP":						"finger_up",
+	"JOYAXISMOTION":				"joy_axis_motion",
+	"JOYBALLMOTION":				"joy_ball_motion",
+	"JOYBUTTONDOWN":				"joy_button_down",
+	"JOYBUTTONUP":					"joy_button_up",
+	"JOYDEVICEADDED":				"joy_device_added",
+	"JOYDEVICEREMOVED":				"joy_device_removed",
+	"JOYHATMOTION":					"joy_hat_motion",
+	"KEYDOWN":						"key_down",
+	"KEYUP":						"key_up",
+	"MIDIIN":						"midi_in",
+	"MIDIOUT":						"midi_out",
+	"MOUSEBUTTONDOWN":				"mouse_button_down",
+	"MOUSEBUTTONUP":				"mouse_button_up",
+	"MOUSEMOTION":					"mouse_motion",
+	"MOUSEWHEEL":					"mouse_wheel",
+	"MULTIGESTURE":					"multi_gesture_event",
+	"QUIT":							"quit_event",
+	"SYSWMEVENT":					"sys_wm_event",
+	"TEXTEDITING":					"text_editing_event",
+	"TEXTINPUT":					"text_input_event",
+	"VIDEOEXPOSE":					"video_expose",
+	"VIDEORESIZE":					"video_resize",
+	"WINDOWCLOSE":					"window_close_event",
+	"WINDOWENTER":					"window_enter",
+	"WINDOWEXPOSED":				"window_exposed",
+	"WINDOWFOCUSGAINED":			"window_focus_gained",
+	"WINDOWFOCUSLOST":				"window_focus_lost",
+	"WINDOWHIDDEN":					"window_hidden",
+	"WINDOWHITTEST":				"window_hit_test",
+	"WINDOWLEAVE":					"window_leave",
+	"WINDOWMAXIMIZED":				"window_maximized",
+	"WINDOWMINIMIZED":				"window_minimized",
+	"WINDOWMOVED":					"window_moved",
+	"WINDOWRESIZED":				"window_resized",
+	"WINDOWRESTORED":				"window_restored",
+	"WINDOWSHOWN":					"window_shown",
+	"WINDOWSIZECHANGED":			"window_size_changed",
+	"WINDOWTAKEFOCUS":				"window_take_focus"
+}
+
+# Names of the Game function which handles each pygame event type, keyed on the
+# event type. Built once, from the constants defined by this version of pygame,
+# rather than searching pygame.locals each time a Game is created.
+EVENT_METHODS = { getattr(pygame.locals, const): "_evt_" + const.lower() \
+	for const in STATE_HANDLERS if hasattr(pygame.locals, const) }
 
 
 class Game:
@@ -39,6 +119,11 @@ class Game:
 	Game.current is a class variable which will contain a reference to the instance
 	of the game currently running, and can be used as a "global" variable thoughout
 	the code.
+
+	More than one Game may exist in the same process, (i.e. several headless
+	simulations), as long as each is run using "step()", which makes it
+	Game.current while it runs. Objects which would otherwise use Game.current may
+	be given their game explicitly; see GameState, Flipper, Cell and Statusbar.
 	"""
 
 	current				= None		# Not-too-clever substitute for a global variable
@@ -47,6 +132,10 @@ class Game:
 	quiet				= False		# Inhibit sound; mixer is not initialized
 	fullscreen			= False
 	resource_dump		= False		# Resources debugging mode; load filenames instead of files
+	headless			= False		# Use the SDL "dummy" drivers and render off-screen
+	subsystems			= None		# pygame modules to initialize, i.e. ("font", "mixer"); None = all
+	trace_startup		= False		# Log the time taken by each step of startup, up to the first frame
+	block_unhandled_events	= True	# Block event types which the current GameState ignores
 
 	# resource manager settings:
 	resource_dir		= None		# Directory where game data is located,
@@ -55,7 +144,16 @@ class Game:
 	# display settings:
 	fps 				= 60
 	display_flags		= DOUBLEBUF
+	dirty_rendering		= False		# Only redraw sprites which changed; see sprite_groups.DirtyUpdates
+	world_rect			= None		# Area of a world larger than the screen, seen through "camera"
+	limit_fps			= True		# When False, run as fast as possible; clock.tick() never waits
+	max_frames			= None		# When set, exit the main loop after this many frames
 	display_depth		= 32
+	hidden_fps			= None		# Frame rate while the window is hidden or minimized; None = "fps"
+	hidden_render		= True		# When False, nothing is drawn while the window is hidden or minimized
+	render_interval		= 1			# Only draw every this many frames
+	adaptive_quality	= False		# Lower quality when frames run slow; see "initial_pacing()"
+	unfocused_is_hidden	= False		# Treat the window as hidden while it does not have input focus
 	caption				= ""
 	icon				= None
 
@@ -65,20 +163,62 @@ class Game:
 	mixer_channels		= 8
 	mixer_buffer		= 512
 
+	# simulation settings:
+	fixed_timestep		= False		# Update sprites at a fixed rate, independent of the frame rate
+	steps_per_second	= None		# Fixed timestep update rate; defaults to "fps"
+	max_steps_per_frame	= 5			# Limit on the number of catch-up updates done in one frame
+	interpolate_motion	= True		# Draw MovingSprites between their last two positions
+	interpolation_alpha	= 1.0		# Fraction of a timestep elapsed since the last update
+	use_motion_engine	= False		# Move ArrayMovingSprites using numpy; see motion_engine
+
+	# profiler settings:
+	profile				= False		# Time each phase of the main loop; see "profiler"
+	profile_frames		= 300		# Number of frames to keep timings for
+	profile_dump		= None		# File to write timings to on exit (".csv" or ".json")
+	hud_key				= None		# Key which shows / hides the performance HUD; see hud.PerformanceHUD
+
+	# frame capture settings:
+	capture_seconds		= None		# Seconds of frames kept for an instant replay; see capture
+	capture_key			= None		# Key which saves the instant replay
+	capture_dir			= "captures"	# Directory instant replays are saved in
+	capture_format		= "png"		# "png" images or "raw" RGB pixels
+
+	# background task settings:
+	worker_count		= None		# Number of workers used by GameState.submit(); None = default
+	worker_processes	= False		# Run tasks in separate processes instead of threads
+
+	# record / replay settings:
+	random_seed			= None		# Seed for the random number generator
+	record_file			= None		# File to record events and timers to on exit; see replay
+	replay_file			= None		# File to replay instead of taking input; implies "headless"
+
 	# game objects:
 	screen_rect			= None
 	background			= None
 	screen				= None
 	sprites				= None
 	resources			= None
-
-	# timer options:
-	max_timers			= 8
+	camera				= None		# Created when "world_rect" is set; see camera.Camera
+	profiler			= None
+	hud					= None		# PerformanceHUD, while shown
+	capture				= None		# FrameCapture, when "capture_seconds" is set
+	pacer				= None		# FramePacer, when "adaptive_quality" is set; see pacing
+	motion_engine		= None		# MotionEngine, when "use_motion_engine" is set
+	clock				= None		# pygame Clock used by _main_loop()
+	recording			= None		# Recording made or being replayed; see replay.Recording
+	frame_count			= 0			# Number of frames completed by _main_loop()
+	game_time			= 0.0		# Milliseconds of game time; the timers' clock; see _end_frame()
+	event_count			= 0			# Number of events handled on the last frame
+	window_hidden		= False		# True while the window is hidden or minimized; see "hidden_fps"
+	loading_progress	= None		# Fraction of the next GameState's preloading done; see GameState.preload()
+	startup_times		= None		# (step, milliseconds) of each step of startup, when "trace_startup" is set
 
 	# internal state management:
 	_state				= None		# It's pretty important to keep this managed, hence, it's "protected"
 	_stay_in_loop		= True		# Setting this to "False" exits the game, calling "exit_loop()"
 	_next_state			= None		# Next game state waiting for change at end of main loop
+	_repaint			= False		# Redraw the whole screen on the next frame
+	_stopped			= False		# True after _stop_loop() has run
 
 	LAYER_BG			= 1			#
 	LAYER_ABOVE_BG		= 2			#
@@ -124,31 +264,110 @@ class Game:
 			p.exit(MyGameClass(options).run())
 
 		"""
+		self._started = monotonic()
 		Game.current = self
 		if options is not None:
 			for varname, value in options.__dict__.items():
 				setattr(self, varname, value)
+		if self.replay_file is not None:
+			self.recording = Recording.load(self.replay_file)
+			self.headless = True
+			self.max_frames = len(self.recording) if self.max_frames is None \
+				else min(self.max_frames, len(self.recording))
+		if self.headless:
+			os.environ["SDL_VIDEODRIVER"] = "dummy"
+			os.environ["SDL_AUDIODRIVER"] = "dummy"
 		if self.resource_dir is None:
 			self.resource_dir = "resources"
 		self.resources = Resources(self.resource_dir, self.resource_dump)
+		if self.trace_startup:
+			self.startup_times = []
+			self._trace("options")
+		self._init_pygame()
+		self._trace("pygame")
+		if self.world_rect is not None:
+			if self.dirty_rendering:
+				logging.warning("dirty_rendering is not used when the game has a world_rect")
+			self.camera = Camera(self.world_rect)
+			self.sprites = CameraUpdates(self.camera, screen_layers = (self.LAYER_OVERLAY,))
+		elif self.dirty_rendering:
+			self.sprites = DirtyUpdates()
+		else:
+			self.sprites = SleepingUpdates()
+		if self.profile:
+			self.profiler = FrameProfiler(self.profile_frames)
+		if self.use_motion_engine:
+			from legame.motion_engine import MotionEngine	# Requires numpy, so only imported when used
+			self.motion_engine = MotionEngine()
+		if self.adaptive_quality:
+			self.pacer = FramePacer(self.fps)
+			self.initial_pacing(self.pacer)
+		if self.capture_seconds:
+			self.capture = FrameCapture(self.capture_dir,
+				int(self.capture_seconds * self.fps), self.capture_format)
+
+		# Event handler mapping. User events are handled in _run_frame().
+		self._event_handlers = { event_type: getattr(self, method_name) \
+			for event_type, method_name in EVENT_METHODS.items() }
+		self._hidden_by = set()				# Reasons the window is considered hidden
+		self._executor = None				# Created by the first call to "_submit()"
+		self._tasks = {}					# (state, callback) of submitted tasks, keyed on Future
+		self._finished_tasks = SimpleQueue()	# Futures done, waiting for their callback
+		self._coroutines = {}				# GameState which started each running asyncio Task
+		self._loader = None					# Runs GameState.preload() functions; see "change_state()"
+		self._preloads = []					# Futures of the next GameState's preload functions
+		self._async = False					# True when run using "run_async()"
+		self._timers = TimerQueue()			# Timed in milliseconds of "game_time"
+		self._frame_timers = TimerQueue()	# Timed in frames
+		self._replaying = self.recording is not None
+		self._handle_base = new_handle()
+		if self._replaying:
+			self.random_seed = self.recording.seed
+		elif self.record_file is not None:
+			if self.random_seed is None:
+				self.random_seed = random.randrange(2 ** 32)
+			self.recording = Recording(self.random_seed, self._handle_base)
+		if self.random_seed is not None:
+			random.seed(self.random_seed)
+		self._trace("init")
+
+	def _init_pygame(self):
+		"""
+		Initializes the pygame modules named in "subsystems", or all of them, (using
+		pygame.init()), if "subsystems" is None. The display is always initialized, as
+		the event queue depends upon it. The mixer is never initialized if "quiet" is
+		set.
+
+		Initializing only the modules which a game uses makes it start faster.
+		"""
 		if not self.quiet:
 			pygame.mixer.pre_init(self.mixer_frequency, self.mixer_bitsize,
 			self.mixer_channels, self.mixer_buffer)
-		pygame.init()
-		self.sprites = pygame.sprite.LayeredUpdates()
-
-		# Event handler mapping.
-		self._event_handlers = dict([
-			(getattr(pygame.locals, const), getattr(self, '_evt_' + const.lower())) \
-			for const in dir(pygame.locals) \
-			if hasattr(self, '_evt_' + const.lower())])
-
-		# Fill-in the remaining timer events:
-		for event_type in range(USEREVENT, NUMEVENTS + 1):
-			self._event_handlers[event_type] = self.__timer_event
-		self.__timer_callbacks = [None for x in range(self.max_timers)]
-		self.__timer_arguments = [None for x in range(self.max_timers)]
-		self.__timer_recur_flag = [None for x in range(self.max_timers)]
+		if self.subsystems is None:
+			pygame.init()
+			return
+		pygame.display.init()
+		for name in self.subsystems:
+			if name == "display" or (name == "mixer" and self.quiet):
+				continue
+			getattr(pygame, name).init()
+
+	def _trace(self, step):
+		"""
+		When "trace_startup" is set, records the time since the Game was constructed
+		as the time the given step of startup was done.
+		"""
+		if self.trace_startup:
+			self.startup_times.append((step, (monotonic() - self._started) * 1000.0))
+
+	def _report_startup(self):
+		"""
+		Logs the times recorded by "_trace()". Called at the end of the first frame.
+		"""
+		last = 0.0
+		for step, milliseconds in self.startup_times:
+			logging.info("Startup %-14s %8.1f ms  (+%.1f)", step, milliseconds, milliseconds - last)
+			last = milliseconds
 
 	def set_resource_dir_from_file(self, filename):
 		"""
@@ -173,24 +392,174 @@ class Game:
 		an object of class GameState.
 		"""
 		self.show()
-		self._state = self.initial_state()
-		self._state.enter_state()	# Immediately enter state, not waiting for "_main_loop()"
-		self._next_state = None	# Clear this, as it was set in "change_state()"
+		self._trace("show")
+		self._enter_initial_state()
 		self._main_loop()
 		pygame.quit()
 		return 0
 
+	def run_async(self):
+		"""
+		Runs the game in an asyncio event loop. Works the same as "run()", except that
+		instead of waiting for the next frame, the main loop sleeps using
+		asyncio.sleep(), so that other asyncio tasks can run in the meantime.
+
+		When run this way, GameState event handlers, "enter_state()", "loop_start()"
+		and "loop_end()" may be coroutines, (defined using "async def"). A coroutine
+		handler is started as an asyncio Task, and runs alongside the main loop; the
+		main loop does not wait for it to finish. Tasks started by a GameState are
+		cancelled when the GameState is exited.
+		"""
+		self._async = True
+		self.show()
+		self._trace("show")
+		asyncio.run(self._run_async())
+		pygame.quit()
+		return 0
+
+	def step(self, frames = 1):
+		"""
+		Runs "frames" times through the main loop, then returns, so that the game can
+		be driven from outside, one frame at a time. The first call shows the game and
+		enters the initial state.
+
+		While stepping, this Game is made Game.current, (see "activated()"), so that
+		several Games can be stepped in turn in the same process without interfering.
+		Each step advances the game by exactly one frame's worth of time, however long
+		it actually takes, and does not wait between frames. This includes the
+		"game_time" which timers set using "set_timeout()" and "set_interval()" are
+		measured in, so they fire on the same frame every run. Note that pygame's event
+		queue is shared by all the Games in the process; only one of them should
+		expect real input.
+
+		Returns False once the game has exited, (i.e. after "shutdown()" or when
+		"max_frames" is reached), otherwise True.
+		"""
+		with self.activated():
+			if self.clock is None:
+				self.show()
+				self._trace("show")
+				self._enter_initial_state()
+				self._start_loop()
+			for frame in range(frames):
+				if not self._stay_in_loop:
+					break
+				self._run_frame()
+				self.clock.tick()
+				self._end_frame(self._frame_ms)
+			if not self._stay_in_loop and not self._stopped:
+				self._stop_loop()
+		return self._stay_in_loop
+
+	@contextmanager
+	def activated(self):
+		"""
+		Makes this Game the Game.current for the duration of a "with" block, i.e.:
+
+			with game.activated():
+				Piece(cell, color)
+
+		Game.current is restored at the end of the block.
+		"""
+		previous = Game.current
+		Game.current = self
+		try:
+			yield self
+		finally:
+			Game.current = previous
+
+	async def _run_async(self):
+		self._enter_initial_state()
+		await self._main_loop_async()
+
+	def _enter_initial_state(self):
+		"""
+		Gets the GameState returned by "initial_state" and enters it immediately, not
+		waiting for "_main_loop()".
+		"""
+		self._state = self.initial_state()
+		wait(self._preloads)
+		self._preloaded()
+		self._start_coroutine(self._state.enter_state())
+		self._next_state = None	# Clear this, as it was set in "change_state()"
+		self._filter_events()
+		self._trace("initial_state")
+
+	def _filter_events(self):
+		"""
+		Called when entering a new GameState. Blocks every event type which is
+		handled neither by the current GameState nor by this Game, so that pygame never
+		puts them on the event queue. Event types which are handled are allowed.
+
+		An event type is considered handled when the GameState, or this Game, overrides
+		the function which handles it. See STATE_HANDLERS.
+
+		Event types listed in "_required_events()" are always allowed, as are user
+		event types. Does nothing if "block_unhandled_events" is False.
+		"""
+		if not self.block_unhandled_events:
+			return
+		required = self._required_events()
+		allowed, blocked = [], []
+		for const, handler_name in STATE_HANDLERS.items():
+			event_type = getattr(pygame.locals, const, None)
+			if event_type is None:
+				continue
+			if event_type in required or self._handles(const, handler_name):
+				allowed.append(event_type)
+			else:
+				blocked.append(event_type)
+		pygame.event.set_allowed(allowed)
+		pygame.event.set_blocked(blocked)
+
+	def _required_events(self):
+		"""
+		Returns a set of the event types which must never be blocked, regardless of
+		whether or not the current GameState handles them.
+		"""
+		required = { pygame.QUIT }
+		if self.hud_key is not None or self.capture_key is not None:
+			required.add(pygame.KEYDOWN)
+		if self.hidden_fps is not None or not self.hidden_render:
+			required.update((pygame.WINDOWHIDDEN, pygame.WINDOWSHOWN,
+				pygame.WINDOWMINIMIZED, pygame.WINDOWRESTORED))
+			if self.unfocused_is_hidden:
+				required.update((pygame.WINDOWFOCUSLOST, pygame.WINDOWFOCUSGAINED))
+		return required
+
+	def _handles(self, const, handler_name):
+		"""
+		Returns True if this Game's event handler for the event type named "const", or
+		the current GameState's "handler_name" function is overridden.
+		"""
+		evt_name = "_evt_" + const.lower()
+		if getattr(type(self), evt_name, None) is not getattr(Game, evt_name, None):
+			return True
+		return handler_name in self._state.__dict__ \
+			or getattr(type(self._state), handler_name, None) is not getattr(GameState, handler_name)
+
 	def show(self):
 		"""
 		Initilizes the screen.
 
 		Make sure that you implement "initial_background", as that is what will be shown.
 
+		When "headless" is set, the game is drawn on an off-screen Surface instead of
+		the display, and nothing is shown.
+
 		It is safe to call this function multiple times.
 		"""
 		display_size = pygame.display.Info().current_w, pygame.display.Info().current_h
 		self.background = self.initial_background(display_size)
 		self.screen_rect = self.background.get_rect()
+		if self.camera is not None:
+			self.camera.resize(self.screen_rect.size)
+		if self.headless:
+			if pygame.display.get_surface() is None:
+				pygame.display.set_mode((1, 1))	# Needed by Surface.convert()
+			self.screen = Surface(self.screen_rect.size)
+			self.screen.blit(self.background, (0,0))
+			return
 		if self.fullscreen:
 			self.display_flags |= (FULLSCREEN | SCALED)
 		else:
@@ -219,6 +588,15 @@ class Game:
 		"""
 		return GameState()
 
+	def initial_pacing(self, pacer):
+		"""
+		Called when the "adaptive_quality" option is set, to register the fallbacks
+		used to keep up with the frame rate with the given pacing.FramePacer. By
+		default, the only fallback is drawing every other frame. Override this to use
+		others; see the pacing module.
+		"""
+		pacer.add_attribute(self, "render_interval", 2)
+
 	def shutdown(self):
 		"""
 		Triggers the _main_loop to exit. The _main_loop will finish its current
@@ -239,47 +617,297 @@ class Game:
 		In such circumstances, the last call to this function takes precedence - with
 		one caveat. If any game state subclasses GameStateFinal, the game state may not
 		be changed at all.
+
+		If the new GameState has anything to preload, (see GameState.preload()), the
+		loading is done in the background, and the change happens on the first time
+		through main_loop after it is done. Until then, the current state keeps
+		running, and "loading_progress" tells how much has been loaded.
 		"""
 		if isinstance(self._next_state, GameStateFinal):
 			logging.warning("Cannot change game state when current state is GameStateFinal")
 		else:
 			self._next_state = game_state
+			self._start_preload(game_state)
+
+	def _start_preload(self, game_state):
+		"""
+		Starts running the functions returned by the given GameState's "preload()"
+		in the background, cancelling any preloading started for another GameState.
+		"""
+		for future in self._preloads:
+			future.cancel()
+		functions = game_state.preload()
+		if functions:
+			if self._loader is None:
+				self._loader = ThreadPoolExecutor(self.worker_count)
+			self._preloads = [ self._loader.submit(function) for function in functions ]
+			self.loading_progress = 0.0
+		else:
+			self._preloads = []
+			self.loading_progress = None
+
+	def _preloaded(self):
+		"""
+		Returns True when all of the next GameState's preload functions are done,
+		updating "loading_progress". Errors raised by preload functions are logged.
+		"""
+		if not self._preloads:
+			return True
+		done = sum(future.done() for future in self._preloads)
+		self.loading_progress = done / len(self._preloads)
+		if done < len(self._preloads):
+			return False
+		for future in self._preloads:
+			if future.exception() is not None:
+				logging.error("Error preloading", exc_info = future.exception())
+		self._preloads = []
+		self.loading_progress = None
+		return True
 
 	###############################################################################################
 
 	def _main_loop(self):
-		clock = pygame.time.Clock()
+		self._start_loop()
 		while self._stay_in_loop:
-			self._state.loop_start()
-			for event in pygame.event.get():
-				try:
-					self._event_handlers[event.type](event)
-				except KeyError:
-					logging.warning('Unknown event "%s"', event_name(event.type))
+			self._run_frame()
+			if self.limit_fps and not self._replaying:
+				self._end_frame(self.clock.tick(self._frame_rate()))
+			else:
+				self._end_frame(self.clock.tick())
+		self._stop_loop()
 
-			self._end_loop()
+	async def _main_loop_async(self):
+		"""
+		The same as _main_loop(), but instead of waiting in clock.tick() for the rest
+		of each frame, sleeps using asyncio.sleep(), so that other asyncio tasks can
+		run. Every frame yields to the event loop at least once.
+		"""
+		self._start_loop()
+		while self._stay_in_loop:
+			started = monotonic()
+			self._run_frame()
+			delay = 0.0
+			if self.limit_fps and not self._replaying:
+				delay = max(0.0, 1.0 / self._frame_rate() - (monotonic() - started))
+			await asyncio.sleep(delay)
+			self._end_frame(self.clock.tick())
+		self._stop_loop()
+
+	def _start_loop(self):
+		"""
+		Called when the main loop starts, to set up the clock and the fixed timestep.
+		"""
+		self.clock = pygame.time.Clock()
+		self._frame_ms = 1000.0 / self.fps
+		self._step_ms = 1000.0 / (self.steps_per_second or self.fps)
+		self._lag = self._step_ms
+
+	def _run_frame(self):
+		"""
+		Runs one time through the main loop, up to the point of waiting for the next
+		frame.
+		"""
+		profiler = self.profiler
+		replaying = self._replaying
+		step_ms = self._step_ms
+		if self.pacer is not None: started = monotonic()
+		if profiler: profiler.start()
+		self._start_coroutine(self._state.loop_start())
+		if profiler: profiler.lap("loop_start")
+		if replaying:
+			pygame.event.clear()
+			events, timers, self._replay_ms = \
+				self.recording.play(self._handle_base) or ([], [], step_ms)
+		else:
+			events = pygame.event.get()
+		self.event_count = len(events)
+		handlers = self._event_handlers
+		for event in events:
+			handler = handlers.get(event.type)
+			if handler is None:
+				if USEREVENT <= event.type <= NUMEVENTS:
+					handler = self._evt_userevent
+				else:
+					logging.warning('Unknown event "%s"', event_name(event.type))
+					continue
+			result = handler(event)
+			if result is not None:
+				self._start_coroutine(result)
+		if replaying:
+			fired = self._timers.fire(timers)
+		else:
+			fired = self._timers.run(self.game_time)
+		self._frame_timers.run(self.frame_count)
+		if self._tasks:
+			self._finish_tasks()
+		if profiler: profiler.lap("events")
+
+		self._start_coroutine(self._end_loop())
+		if profiler: profiler.lap("loop_end")
+		if self.fixed_timestep:
+			steps = 0
+			lag = self._lag
+			while lag >= step_ms and steps < self.max_steps_per_frame:
+				lag -= step_ms
+				steps += 1
+				if self.interpolate_motion and \
+					(lag < step_ms or steps == self.max_steps_per_frame):
+					self._remember_positions()	# Before the last step this frame
+				self.sprites.update()
+				if self.motion_engine is not None:
+					self.motion_engine.step()
+			if lag >= step_ms:
+				lag %= step_ms	# Too far behind to catch up; drop the backlog
+			self._lag = lag
+			self.interpolation_alpha = lag / step_ms
+			if self.interpolate_motion:
+				self._interpolate_sprites()
+		else:
 			self.sprites.update()
+			if self.motion_engine is not None:
+				self.motion_engine.step()
+		if profiler: profiler.lap("update")
+		rendering = (self.hidden_render or not self.window_hidden) and \
+			(self.render_interval == 1 or self.frame_count % self.render_interval == 0)
+		if rendering:
+			if self._repaint:
+				self.screen.blit(self.background, (0, 0))
 			self.sprites.clear(self.screen, self.background)
-			pygame.display.update(self.sprites.draw(self.screen))
-			if self._next_state:
-				self._state.exit_state(self._next_state)
-				self._state = self._next_state
-				self._next_state = None
-				self._state.enter_state()
-			clock.tick(self.fps)
+		if profiler: profiler.lap("clear")
+		if rendering:
+			dirty_rects = self.sprites.draw(self.screen)
+		if profiler: profiler.lap("draw")
+		if rendering and not self.headless:
+			pygame.display.update(None if self._repaint else dirty_rects)
+		if rendering:
+			if self.capture is not None:
+				self.capture.capture(self.screen, None if self._repaint else dirty_rects)
+			self._repaint = False
+		if profiler: profiler.lap("display")
+		if self._next_state and self._preloaded():
+			self._cancel_tasks(self._state)
+			self._state.exit_state(self._next_state)
+			self._state = self._next_state
+			self._next_state = None
+			self._start_coroutine(self._state.enter_state())
+			self._filter_events()
+		self.frame_count += 1
+		if self.trace_startup and self.frame_count == 1:
+			self._trace("first_frame")
+			self._report_startup()
+		if self.frame_count == self.max_frames:
+			self._stay_in_loop = False
+		self._frame_events, self._fired = events, fired
+		if self.pacer is not None:
+			self.pacer.update((monotonic() - started) * 1000.0)
+
+	def _end_frame(self, elapsed_ms):
+		"""
+		Called after waiting for the next frame, with the number of milliseconds since
+		the last frame ended. Advances the fixed timestep and the "game_time", and
+		records the frame when recording.
+
+		When the frame rate is limited, the time of a frame is the real time which
+		passed. Otherwise, (and when stepped), each frame takes exactly 1 / "fps"
+		seconds, so that the game runs the same however fast the computer is, and the
+		same as it would in real time.
+		"""
+		if self._replaying:
+			frame_ms = self._replay_ms
+		elif self.limit_fps:
+			frame_ms = elapsed_ms
+		else:
+			frame_ms = self._frame_ms	# Exactly one frame at "fps"
+		self._lag += frame_ms
+		self.game_time += frame_ms
+		if self.recording is not None and not self._replaying:
+			self.recording.record(self._frame_events, self._fired, frame_ms)
+
+	def _stop_loop(self):
+		"""
+		Called when the main loop exits. Saves the profile and recording, if any,
+		stops background tasks, and calls "exit_loop()".
+		"""
+		self._stopped = True
+		if self.profiler and self.profile_dump:
+			self.profiler.dump(self.profile_dump)
+		if self.recording is not None and not self._replaying:
+			self.recording.save(self.record_file)
+		if self.capture is not None:
+			self.capture.close()
+		if self._executor is not None:
+			self._executor.shutdown(wait = False, cancel_futures = True)
+			self._executor = None
+		if self._loader is not None:
+			self._loader.shutdown(wait = False, cancel_futures = True)
+			self._loader = None
+		for task in list(self._coroutines):
+			task.cancel()
 		for cls in self.__class__.mro():
 			if "exit_loop" in cls.__dict__:
 				cls.exit_loop(self)
 
+	def _frame_rate(self):
+		"""
+		Returns the frame rate to limit the main loop to; "fps", or "hidden_fps" while
+		the window is hidden.
+		"""
+		return self.hidden_fps if self.window_hidden and self.hidden_fps else self.fps
+
 	###############################################################################################
 
+	def _remember_positions(self):
+		"""
+		Called from _main_loop() when using a fixed timestep, before the last update
+		of the frame. Keeps the position of each MovingSprite, for interpolation.
+		"""
+		for sprite in self.sprites.sprites():
+			if isinstance(sprite, BaseMovingSprite):
+				sprite.remember_position()
+
+	def _interpolate_sprites(self):
+		"""
+		Called from _main_loop() when using a fixed timestep, after updating sprites.
+		Positions the "rect" of each MovingSprite part way between its previous and
+		current position, by the fraction of a timestep given in "interpolation_alpha".
+		"""
+		alpha = self.interpolation_alpha
+		for sprite in self.sprites.sprites():
+			if isinstance(sprite, BaseMovingSprite):
+				sprite.interpolate(alpha)
+
+	def _set_window_hidden(self, reason, hidden):
+		"""
+		Called when the window is hidden, minimized or loses focus, (when
+		"unfocused_is_hidden" is set), and when it is shown again. "reason" is one of
+		"hidden", "minimized", or "unfocused".
+
+		Sets "window_hidden", which reduces the frame rate to "hidden_fps", and skips
+		drawing if "hidden_render" is False. When the window is no longer hidden, the
+		whole screen is redrawn.
+		"""
+		if hidden:
+			self._hidden_by.add(reason)
+		else:
+			self._hidden_by.discard(reason)
+		was_hidden = self.window_hidden
+		self.window_hidden = bool(self._hidden_by)
+		if was_hidden and not self.window_hidden:
+			self._repaint = True
+			if hasattr(self.sprites, "invalidate"):
+				self.sprites.invalidate()
+		logging.debug("Window %s %s", reason, "on" if hidden else "off")
+
 	def _end_loop(self):
 		"""
 		Called at the end of the _main_loop().
 		The default implementation is to call "loop_end()" on the current GameState.
 		This behaviour is overridden in NetworkGame in order to handle message transfer.
+
+		An override must return the value returned by "loop_end()", so that when
+		"loop_end()" is a coroutine, it is started; see "run_async()".
 		"""
-		self._state.loop_end()
+		return self._state.loop_end()
 
 	def exit_loop(self):
 		"""
@@ -290,229 +918,329 @@ class Game:
 	# Event handlers:
 
 	def _evt_activeevent(self, event):
-		self._state.active_event(event)
+		return self._state.active_event(event)
 
 	def _evt_audiodeviceadded(self, event):
-		self._state.audio_device_added(event)
+		return self._state.audio_device_added(event)
 
 	def _evt_audiodeviceremoved(self, event):
-		self._state.audio_device_removed(event)
+		return self._state.audio_device_removed(event)
 
 	def _evt_controlleraxismotion(self, event):
-		self._state.controller_axis_motion(event)
+		return self._state.controller_axis_motion(event)
 
 	def _evt_controllerbuttondown(self, event):
-		self._state.controller_button_down(event)
+		return self._state.controller_button_down(event)
 
 	def _evt_controllerbuttonup(self, event):
-		self._state.controller_button_up(event)
+		return self._state.controller_button_up(event)
 
 	def _evt_controllerdeviceadded(self, event):
-		self._state.controller_device_added(event)
+		return self._state.controller_device_added(event)
 
 	def _evt_controllerdeviceremapped(self, event):
-		self._state.controller_device_remapped(event)
+		return self._state.controller_device_remapped(event)
 
 	def _evt_controllerdeviceremoved(self, event):
-		self._state.controller_device_removed(event)
+		return self._state.controller_device_removed(event)
 
 	def _evt_dropbegin(self, event):
-		self._state.drop_begin_event(event)
+		return self._state.drop_begin_event(event)
 
 	def _evt_dropcomplete(self, event):
-		self._state.drop_complete_event(event)
+		return self._state.drop_complete_event(event)
 
 	def _evt_dropfile(self, event):
-		self._state.drop_file_event(event)
+		return self._state.drop_file_event(event)
 
 	def _evt_droptext(self, event):
-		self._state.drop_text_event(event)
+		return self._state.drop_text_event(event)
 
 	def _evt_fingerdown(self, event):
-		self._state.finger_down(event)
+		return self._state.finger_down(event)
 
 	def _evt_fingermotion(self, event):
-		self._state.finger_motion(event)
+		return self._state.finger_motion(event)
 
 	def _evt_fingerup(self, event):
-		self._state.finger_up(event)
+		return self._state.finger_up(event)
 
 	def _evt_joyaxismotion(self, event):
-		self._state.joy_axis_motion(event)
+		return self._state.joy_axis_motion(event)
 
 	def _evt_joyballmotion(self, event):
-		self._state.joy_ball_motion(event)
+		return self._state.joy_ball_motion(event)
 
 	def _evt_joybuttondown(self, event):
-		self._state.joy_button_down(event)
+		return self._state.joy_button_down(event)
 
 	def _evt_joybuttonup(self, event):
-		self._state.joy_button_up(event)
+		return self._state.joy_button_up(event)
 
 	def _evt_joydeviceadded(self, event):
-		self._state.joy_device_added(event)
+		return self._state.joy_device_added(event)
 
 	def _evt_joydeviceremoved(self, event):
-		self._state.joy_device_removed(event)
+		return self._state.joy_device_removed(event)
 
 	def _evt_joyhatmotion(self, event):
-		self._state.joy_hat_motion(event)
+		return self._state.joy_hat_motion(event)
 
 	def _evt_keydown(self, event):
-		self._state.key_down(event)
+		if event.key == self.hud_key:
+			self.toggle_hud()
+		elif event.key == self.capture_key and self.capture is not None:
+			self.capture.dump()
+		else:
+			return self._state.key_down(event)
 
 	def _evt_keyup(self, event):
-		self._state.key_up(event)
+		return self._state.key_up(event)
 
 	def _evt_midiin(self, event):
-		self._state.midi_in(event)
+		return self._state.midi_in(event)
 
 	def _evt_midiout(self, event):
-		self._state.midi_out(event)
+		return self._state.midi_out(event)
 
 	def _evt_mousebuttondown(self, event):
-		self._state.mouse_button_down(event)
+		return self._state.mouse_button_down(event)
 
 	def _evt_mousebuttonup(self, event):
-		self._state.mouse_button_up(event)
+		return self._state.mouse_button_up(event)
 
 	def _evt_mousemotion(self, event):
-		self._state.mouse_motion(event)
+		return self._state.mouse_motion(event)
 
 	def _evt_mousewheel(self, event):
-		self._state.mouse_wheel(event)
+		return self._state.mouse_wheel(event)
 
 	def _evt_multigesture(self, event):
-		self._state.multi_gesture_event(event)
+		return self._state.multi_gesture_event(event)
 
 	def _evt_quit(self, event):
-		self._state.quit_event(event)
+		return self._state.quit_event(event)
 
 	def _evt_syswmevent(self, event):
-		self._state.sys_wm_event(event)
+		return self._state.sys_wm_event(event)
 
 	def _evt_textediting(self, event):
-		self._state.text_editing_event(event)
+		return self._state.text_editing_event(event)
 
 	def _evt_textinput(self, event):
-		self._state.text_input_event(event)
+		return self._state.text_input_event(event)
 
 	def _evt_videoexpose(self, event):
-		self._state.video_expose(event)
+		return self._state.video_expose(event)
 
 	def _evt_videoresize(self, event):
-		self._state.video_resize(event)
+		return self._state.video_resize(event)
 
 	def _evt_windowclose(self, event):
-		self._state.window_close_event(event)
+		return self._state.window_close_event(event)
 
 	def _evt_windowenter(self, event):
-		self._state.window_enter(event)
+		return self._state.window_enter(event)
 
 	def _evt_windowexposed(self, event):
-		self._state.window_exposed(event)
+		return self._state.window_exposed(event)
 
 	def _evt_windowfocusgained(self, event):
-		self._state.window_focus_gained(event)
+		if self.unfocused_is_hidden:
+			self._set_window_hidden("unfocused", False)
+		return self._state.window_focus_gained(event)
 
 	def _evt_windowfocuslost(self, event):
-		self._state.window_focus_lost(event)
+		if self.unfocused_is_hidden:
+			self._set_window_hidden("unfocused", True)
+		return self._state.window_focus_lost(event)
 
 	def _evt_windowhidden(self, event):
-		self._state.window_hidden(event)
+		self._set_window_hidden("hidden", True)
+		return self._state.window_hidden(event)
 
 	def _evt_windowhittest(self, event):
-		self._state.window_hit_test(event)
+		return self._state.window_hit_test(event)
 
 	def _evt_windowleave(self, event):
-		self._state.window_leave(event)
+		return self._state.window_leave(event)
 
 	def _evt_windowmaximized(self, event):
-		self._state.window_maximized(event)
+		return self._state.window_maximized(event)
 
 	def _evt_windowminimized(self, event):
-		self._state.window_minimized(event)
+		self._set_window_hidden("minimized", True)
+		return self._state.window_minimized(event)
 
 	def _evt_windowmoved(self, event):
-		self._state.window_moved(event)
+		return self._state.window_moved(event)
 
 	def _evt_windowresized(self, event):
-		self._state.window_resized(event)
+		return self._state.window_resized(event)
 
 	def _evt_windowrestored(self, event):
-		self._state.window_restored(event)
+		self._set_window_hidden("minimized", False)
+		return self._state.window_restored(event)
 
 	def _evt_windowshown(self, event):
-		self._state.window_shown(event)
+		self._set_window_hidden("hidden", False)
+		return self._state.window_shown(event)
 
 	def _evt_windowsizechanged(self, event):
-		self._state.window_size_changed(event)
+		return self._state.window_size_changed(event)
 
 	def _evt_windowtakefocus(self, event):
-		self._state.window_take_focus(event)
+		return self._state.window_take_focus(event)
+
+	def _evt_userevent(self, event):
+		return self._state.user_event(event)
 
 	# Timers:
 
 	def set_timeout(self, callback, milliseconds, **kwargs):
 		"""
-		Starts a timer using pygame.time.set_timer() which executes a given callback
-		only once.
+		Starts a timer which executes a given callback only once.
 
 		The given "callback" is a function to execute after the "milliseconds"
 		interval expires. Any keyword arguments after the "milliseconds"
 		argument are passed as a dictionary to the given callback function.
 
-		Returns an (integer) index identifying the timer, which can be used to cancel
-		the timer by calling "clear_timeout()"
+		Timers are checked once each time through the _main_loop(), after event
+		handling, so a callback is executed on the first frame after it is due.
+		Time is measured in "game_time"; see "_end_frame()".
+
+		Returns an (integer) handle identifying the timer, which can be used to cancel
+		the timer by calling "clear_timeout()". Handles are never reused.
 		"""
-		return self.__set_timeout(callback, milliseconds, kwargs, False)
+		return self._timers.add(self.game_time + milliseconds, callback, kwargs)
 
 	def set_interval(self, callback, milliseconds, **kwargs):
 		"""
-		Starts a timer using pygame.time.set_timer() which executes a given callback
-		at a repeated interval.
+		Starts a timer which executes a given callback at a repeated interval.
 
 		The given "callback" is a function to execute after the "milliseconds"
 		interval expires. Any keyword arguments after the "milliseconds"
 		argument are passed as a dictionary to the given callback function.
 
-		Returns an (integer) index identifying the timer, which can be used to cancel
+		Returns an (integer) handle identifying the timer, which can be used to cancel
 		the timer by calling "clear_timeout()"
 		"""
-		return self.__set_timeout(callback, milliseconds, kwargs, True)
+		milliseconds = max(1, milliseconds)
+		return self._timers.add(self.game_time + milliseconds, callback, kwargs, milliseconds)
 
-	def clear_timeout(self, timer_index):
+	def set_frame_timeout(self, callback, frames, **kwargs):
 		"""
-		Clears a timer previously set using "set_timeout()"
+		Starts a timer which executes a given callback only once, after the given
+		number of "frames" (times through the _main_loop) have passed. A timer set
+		for 1 frame is executed on the next frame.
+
+		Frame timers are not affected by changes in the frame rate. Otherwise, they
+		work the same as "set_timeout()".
 		"""
-		pygame.time.set_timer(USEREVENT + timer_index, 0)
-		self.__timer_callbacks[timer_index] = None
+		return self._frame_timers.add(self.frame_count + frames, callback, kwargs)
 
-	def __set_timeout(self, callback, milliseconds, arguments, recur):
-		for timer_index in range(self.max_timers):
-			if self.__timer_callbacks[timer_index] is None:
-				self.__timer_callbacks[timer_index] = callback
-				self.__timer_arguments[timer_index] = arguments
-				self.__timer_recur_flag[timer_index] = recur
-				pygame.time.set_timer(USEREVENT + timer_index, milliseconds)
-				return timer_index
-		raise RuntimeError("Too many timers!")
+	def set_frame_interval(self, callback, frames, **kwargs):
+		"""
+		Starts a timer which executes a given callback every "frames" frames.
 
-	def __timer_event(self, event):
+		Frame timers are not affected by changes in the frame rate. Otherwise, they
+		work the same as "set_interval()".
 		"""
-		Called from the pygame event pump when a timer times out.
-		Executes a timer event.
+		frames = max(1, frames)
+		return self._frame_timers.add(self.frame_count + frames, callback, kwargs, frames)
+
+	def clear_timeout(self, timer):
 		"""
-		timer_index = event.type - USEREVENT	# Subtract USEREVENT constant; indexes start with 0
-		if self.__timer_callbacks[timer_index] is None:
-			logging.warning("Timer event raised when corresponding callback not set")
+		Clears a timer previously set using "set_timeout()", "set_interval()",
+		"set_frame_timeout()" or "set_frame_interval()".
+
+		It is safe to clear a timer which has already fired or been cleared.
+		"""
+		if not self._timers.cancel(timer):
+			self._frame_timers.cancel(timer)
+
+	def timer_count(self):
+		"""
+		Returns the number of timers which are set, counting both time and frame timers.
+		"""
+		return len(self._timers) + len(self._frame_timers)
+
+	def toggle_hud(self):
+		"""
+		Shows the performance HUD in the top-left corner of the screen if not shown,
+		or hides it if shown. Called when the "hud_key" is pressed.
+		"""
+		if self.hud is None:
+			self.hud = PerformanceHUD(self)
+			self.sprites.add(self.hud, layer = self.LAYER_OVERLAY)
 		else:
-			if len(self.__timer_arguments[timer_index]):
-				self.__timer_callbacks[timer_index](self.__timer_arguments[timer_index])
-			else:
-				self.__timer_callbacks[timer_index]()
-			if not self.__timer_recur_flag[timer_index]:
-				self.clear_timeout(timer_index)
+			self.hud.kill()
+			self.hud = None
+
+	def _submit(self, state, callback, function, args, kwargs):
+		"""
+		Runs "function" in the background on behalf of the given GameState, and
+		arranges for "callback" to be called from the main loop when it is done.
+		See GameState.submit().
+		"""
+		if self._executor is None:
+			executor_class = ProcessPoolExecutor if self.worker_processes else ThreadPoolExecutor
+			self._executor = executor_class(self.worker_count)
+		future = self._executor.submit(function, *args, **kwargs)
+		self._tasks[future] = (state, callback)
+		future.add_done_callback(self._finished_tasks.put)
+		return future
+
+	def _finish_tasks(self):
+		"""
+		Called from _main_loop() after event handling. Calls the callback of each
+		task submitted by the current GameState which has finished.
+		"""
+		finished = self._finished_tasks
+		while not finished.empty():
+			future = finished.get()
+			task = self._tasks.pop(future, None)
+			if task is None or future.cancelled():
+				continue		# Cancelled when its GameState was exited
+			state, callback = task
+			if state is self._state and callback is not None:
+				callback(future)
+
+	def _cancel_tasks(self, state):
+		"""
+		Cancels the unfinished tasks submitted by the given GameState. Called when the
+		GameState is exited. Tasks which have already started cannot be stopped, but
+		their callbacks are never called.
+		"""
+		for future in [ future for future, task in self._tasks.items() if task[0] is state ]:
+			future.cancel()
+			del self._tasks[future]
+		for task in [ task for task, task_state in self._coroutines.items() if task_state is state ]:
+			task.cancel()
+
+	def _start_coroutine(self, result):
+		"""
+		Called with the value returned by a GameState handler. If the handler is a
+		coroutine, starts it as an asyncio Task. Raises RuntimeError if the game was
+		not started using "run_async()".
+		"""
+		if not asyncio.iscoroutine(result):
+			return
+		if not self._async:
+			result.close()
+			raise RuntimeError("Coroutine handlers require the game to be started using run_async()")
+		task = asyncio.get_running_loop().create_task(result)
+		self._coroutines[task] = self._state
+		task.add_done_callback(self._coroutine_done)
+
+	def _coroutine_done(self, task):
+		"""
+		Called when a Task started by "_start_coroutine()" finishes. Logs any exception
+		it raised.
+		"""
+		del self._coroutines[task]
+		if not task.cancelled() and task.exception() is not None:
+			logging.error("Error in %s", task.get_coro().__qualname__, exc_info = task.exception())
 
 	def play(self, sound_name):
 		"""
@@ -524,16 +1252,47 @@ class Game:
 
 class GameState:
 
+	game				= None		# The Game this GameState belongs to; defaults to Game.current
+	preload_images		= ()		# Names of images to load before entering; see "preload()"
+	preload_image_sets	= ()		# Names of ImageSets to load before entering
+	preload_sounds		= ()		# Names of sounds to load before entering
+
 	def __init__(self, **kwargs):
 		"""
 		Set up this GameState to be the new game state next time through the main loop.
 		The new state will have attributes set by keyword args passed to this function.
 		If the current game state is an instance of "GameStateFinal", the current game
 		state will not be changed.
+
+		Pass "game" to change the state of a Game other than Game.current.
 		"""
 		for varname, value in kwargs.items():
 			setattr(self, varname, value)
-		Game.current.change_state(self)
+		if self.game is None:
+			self.game = Game.current
+		self.game.change_state(self)
+
+	def preload(self):
+		"""
+		Returns a list of functions, (taking no arguments), which load what this
+		GameState needs before it is entered. Called by Game.change_state().
+
+		The functions are run in background threads, while the current GameState keeps
+		running. The Game does not change to this GameState until all of them are done.
+		While waiting, Game.loading_progress goes from 0.0 to 1.0, which the current
+		GameState can show on a loading bar.
+
+		By default, returns functions which load the resources named in
+		"preload_images", "preload_image_sets" and "preload_sounds", so that the
+		Resources calls in "enter_state()", (or in the constructors of the sprites it
+		creates), find them already loaded. Override this to do other slow work, (i.e.
+		generating a level), but remember that the functions run on another thread and
+		must not draw on the screen.
+		"""
+		resources = self.game.resources
+		return [ partial(resources.image, name) for name in self.preload_images ] \
+			+ [ partial(resources.image_set, name) for name in self.preload_image_sets ] \
+			+ [ partial(resources.sound, name) for name in self.preload_sounds ]
 
 	def enter_state(self):
 		"""
@@ -548,6 +1307,28 @@ class GameState:
 		The "next_state" parameter is the GameState object which will replace this one.
 		"""
 
+	def submit(self, callback, function, *args, **kwargs):
+		"""
+		Runs "function" with the given arguments in the background, so that a long
+		computation, (i.e. searching for the computer's next move), does not stop the
+		game from drawing frames.
+
+		When "function" is done, "callback" is called from the main loop, along with
+		event handlers and timers, with the concurrent.futures.Future of the task as
+		its only argument. Use "future.result()" to get the value returned by
+		"function", (this raises any exception the function raised).
+
+		If this GameState is exited before the task is done, the task is cancelled,
+		and "callback" is not called. "callback" may be None.
+
+		Tasks are run in a pool of threads, or processes if the Game's
+		"worker_processes" option is set. When using processes, "function" and its
+		arguments must be picklable, and "function" cannot use pygame.
+
+		Returns the Future.
+		"""
+		return self.game._submit(self, callback, function, args, kwargs)
+
 	# Early / late Game._main_loop() events:
 
 	def loop_start(self):
@@ -555,7 +1336,7 @@ class GameState:
 		Called at the beginning of _main_loop() each time through, before processing events.
 		The event loop looks like this:
 		1. loop_start()                              <-- you are here
-		2. event handling (keyboard, mouse, timers)
+		2. event handling (keyboard, mouse, timers, tasks)
 		3. loop_end()
 		4. move the sprites
 		5. update the display
@@ -567,7 +1348,7 @@ class GameState:
 		Called at the end of _main_loop() each time through.
 		The event loop looks like this:
 		1. loop_start()
-		2. event handling (keyboard, mouse, timers)
+		2. event handling (keyboard, mouse, timers, tasks)
 		3. loop_end()                                <-- you are here
 		4. move the sprites
 		5. update the display
@@ -900,6 +1681,12 @@ class GameState:
 			[unknown]
 		"""
 
+	def user_event(self, event):
+		"""
+		Called for events posted with a type from USEREVENT up to NUMEVENTS.
+		The "event" object has whatever members it was posted with.
+		"""
+
 
 class GameStateFinal(GameState):
 	"""
@@ -0,0 +1,158 @@
+#  legame/hud.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the PerformanceHUD class, a Sprite which shows the frame rate, a graph of
+frame times, and other statistics of the running Game.
+"""
+from collections import deque
+import pygame
+from pygame import Rect, Surface
+from pygame.sprite import Sprite
+
+
+class PerformanceHUD(Sprite):
+	"""
+	An overlay showing how well the Game is running. Shows:
+
+		fps		frames per second, averaged since the last refresh
+		ms		worst frame time since the last refresh
+		spr		number of sprites in "Game.sprites"
+		evt		events handled per frame, averaged since the last refresh
+		tmr		number of timers set
+
+	Below these is a graph of recent frame times. Bars which are taller than the
+	line took longer than a frame at "Game.fps".
+
+	Unlike Callout, this sprite only redraws its image a few times a second, (see
+	"refresh_ms"), and draws text from a cache of rendered characters, so it is
+	cheap enough to leave running.
+
+	Usually created by the Game when "hud_key" is pressed; see Game.toggle_hud().
+	"""
+
+	refresh_ms			= 250		# Milliseconds between redraws of the image
+	graph_width			= 120		# Number of frame times shown in the graph
+	graph_height		= 40
+	font_size			= 18
+	foreground			= (255, 255, 255)
+	background			= (0, 0, 0)
+	alpha				= 180		# Transparency of the background
+	fast_color			= (0, 200, 0)
+	slow_color			= (230, 40, 40)
+
+	def __init__(self, game, font = None):
+		"""
+		"game" is the Game to show statistics for.
+		"font" is the pygame Font to write with. When not given, pygame's default font
+		is used, at "font_size". The pygame font module is initialized if the Game did
+		not initialize it; see Game.subsystems.
+		"""
+		Sprite.__init__(self)
+		self.game = game
+		if not pygame.font.get_init():
+			pygame.font.init()
+		self.font = pygame.font.Font(None, self.font_size) if font is None else font
+		self._glyphs = {}
+		self._frame_times = deque([0] * self.graph_width, self.graph_width)
+		self._line_height = self.font.get_linesize()
+		self._lines = 2
+		width = max(self.graph_width, self.font.size("spr 00000  evt 00.0  tmr 000")[0])
+		self.image = Surface((width, self._lines * self._line_height + self.graph_height))
+		self.image.set_alpha(self.alpha)
+		self.rect = self.image.get_rect()
+		self._last_frame = None
+		self._last_refresh = pygame.time.get_ticks()
+		self._frames = 0
+		self._events = 0
+		self._slowest = 0
+		self.redraw()
+
+	def update(self):
+		"""
+		Called each time the Game's sprites are updated. Records the time taken by the
+		last frame, and redraws the image when "refresh_ms" has passed since the last
+		redraw.
+		"""
+		game = self.game
+		if game.frame_count == self._last_frame:
+			return		# Updated more than once this frame (fixed timestep)
+		self._last_frame = game.frame_count
+		frame_time = game.clock.get_time() if game.clock else 0
+		self._frame_times.append(frame_time)
+		self._frames += 1
+		self._events += game.event_count
+		if frame_time > self._slowest:
+			self._slowest = frame_time
+		if pygame.time.get_ticks() - self._last_refresh >= self.refresh_ms:
+			self.redraw()
+
+	def redraw(self):
+		"""
+		Draws the statistics and graph on this sprite's image.
+		"""
+		game = self.game
+		now = pygame.time.get_ticks()
+		elapsed = now - self._last_refresh
+		fps = self._frames * 1000.0 / elapsed if elapsed else 0.0
+		events = self._events / self._frames if self._frames else 0.0
+		image = self.image
+		image.fill(self.background)
+		self._write("fps %5.1f  ms %3d" % (fps, self._slowest), 0, 0)
+		self._write("spr %d  evt %.1f  tmr %d" % (
+			len(game.sprites), events, game.timer_count()),
+			0, self._line_height)
+		self._draw_graph(self._lines * self._line_height)
+		self.dirty = True
+		self._last_refresh = now
+		self._frames = 0
+		self._events = 0
+		self._slowest = 0
+
+	def _write(self, text, x, y):
+		"""
+		Draws "text" on the image at x, y, using cached renders of each character.
+		"""
+		blit = self.image.blit
+		for char in text:
+			glyph = self._glyphs.get(char)
+			if glyph is None:
+				glyph = self._glyphs[char] = self.font.render(char, True, self.foreground)
+			blit(glyph, (x, y))
+			x += glyph.get_width()
+
+	def _draw_graph(self, top):
+		"""
+		Draws a bar for each of the recent frame times, scaled so that the full
+		height of the graph is two frames at the Game's target frame rate.
+		"""
+		height = self.graph_height
+		target_ms = 1000.0 / self.game.fps
+		scale = height / (2 * target_ms)
+		bottom = top + height
+		fill = self.image.fill
+		for x, frame_time in enumerate(self._frame_times):
+			bar = min(height, int(frame_time * scale))
+			if bar:
+				color = self.fast_color if frame_time <= target_ms else self.slow_color
+				fill(color, Rect(x, bottom - bar, 1, bar))
+		fill(self.foreground, Rect(0, bottom - int(target_ms * scale), self.graph_width, 1))
+
+
+#  end legame/hud.py
@@ -0,0 +1,128 @@
+#  legame/kinematics.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Closed-form functions for the frame-by-frame motion used by MovingSprite, where
+speed is measured in pixels per frame, and acceleration and deceleration in
+pixels per frame, per frame.
+
+Each function takes the same time no matter how large the speed or how small the
+deceleration. Each has an "_array" form, which takes numpy arrays, (or a mix of
+arrays and numbers), and works on every element at once, for use with the
+motion_engine module. The "_array" forms require numpy; the others do not.
+"""
+import math
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
+
+def stopping_frames(speed, decel):
+	"""
+	Returns the number of frames it takes to slow from "speed" to zero, reducing the
+	speed by "decel" each frame.
+	"""
+	return max(0, math.ceil(speed / decel))
+
+def stopping_distance(speed, decel):
+	"""
+	Returns the distance covered while slowing from "speed" to zero, as measured by
+	MovingSprite.seek_motion(). This is the value which legame.triangular() used to
+	calculate recursively; the sum of (speed + decel), speed, (speed - decel) ...
+	down to the first value no more than "decel", which is counted as "decel".
+	"""
+	frames = stopping_frames(speed, decel)
+	return frames * (speed + decel) - decel * frames * (frames - 1) / 2 + decel
+
+def arrival_frames(distance, speed, accel = 0.0, max_speed = math.inf):
+	"""
+	Returns the number of frames it takes to cover "distance", starting at "speed",
+	and adding "accel" to the speed before each frame's move, up to "max_speed".
+	Returns math.inf if the distance will never be covered.
+	"""
+	if distance <= 0:
+		return 0
+	if accel <= 0 or speed >= max_speed:
+		speed = min(speed, max_speed)
+		return math.ceil(distance / speed) if speed > 0 else math.inf
+	b = speed + accel / 2
+	frames = math.ceil((math.sqrt(b * b + 2 * accel * distance) - b) / accel)
+	if max_speed == math.inf:
+		return frames
+	# Frames before the speed is capped; their speeds are speed + accel, speed + 2 * accel ...
+	uncapped = math.ceil((max_speed - speed) / accel) - 1
+	if frames <= uncapped:
+		return frames
+	covered = uncapped * speed + accel * uncapped * (uncapped + 1) / 2
+	return uncapped + math.ceil((distance - covered) / max_speed)
+
+def braking_decel(speed, distance):
+	"""
+	Returns the deceleration needed to stop from "speed" within "distance", using
+	the continuous formula: speed ** 2 / (2 * distance). Returns math.inf if
+	"distance" is zero or less.
+	"""
+	return speed * speed / (2 * distance) if distance > 0 else math.inf
+
+
+def stopping_frames_array(speeds, decels):
+	"""
+	The same as stopping_frames(), for numpy arrays.
+	"""
+	return np.maximum(0, np.ceil(np.divide(speeds, decels)))
+
+def stopping_distance_array(speeds, decels):
+	"""
+	The same as stopping_distance(), for numpy arrays.
+	"""
+	frames = stopping_frames_array(speeds, decels)
+	return frames * np.add(speeds, decels) - np.multiply(decels, frames * (frames - 1) / 2) + decels
+
+def arrival_frames_array(distances, speeds, accels = 0.0, max_speeds = math.inf):
+	"""
+	The same as arrival_frames(), for numpy arrays. Returns a float array, so that
+	it can hold math.inf.
+	"""
+	distances, speeds, accels, max_speeds = np.broadcast_arrays(
+		np.asarray(distances, float), np.asarray(speeds, float),
+		np.asarray(accels, float), np.asarray(max_speeds, float))
+	speeds = np.minimum(speeds, max_speeds)
+	with np.errstate(divide = "ignore", invalid = "ignore"):
+		constant = np.where(speeds > 0, np.ceil(distances / speeds), math.inf)
+		uncapped = np.ceil((max_speeds - speeds) / accels) - 1
+		b = speeds + accels / 2
+		frames = np.ceil((np.sqrt(b * b + 2 * accels * distances) - b) / accels)
+		covered = uncapped * speeds + accels * uncapped * (uncapped + 1) / 2
+		capped = uncapped + np.ceil((distances - covered) / max_speeds)
+	accelerating = (accels > 0) & (speeds < max_speeds)
+	result = np.where(accelerating, np.where(frames <= uncapped, frames, capped), constant)
+	return np.where(distances <= 0, 0.0, result)
+
+def braking_decel_array(speeds, distances):
+	"""
+	The same as braking_decel(), for numpy arrays.
+	"""
+	speeds = np.asarray(speeds, float)
+	distances = np.asarray(distances, float)
+	with np.errstate(divide = "ignore"):
+		return np.where(distances > 0, speeds * speeds / (2 * distances), math.inf)
+
+
+#  end legame/kinematics.py
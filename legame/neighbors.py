@@ -97,7 +97,8 @@ class Neighborhood:
 	want notified of each other's existence using the "observe" function when they
 	are instantiated, and call the "notify_sprites" function of the Neighborhood
 	periodically. Typically this involves overriding the "_end_loop" function of
-	the Game class and calling "notify_sprites" from there. Alternatively, you
+	the Game class and calling "notify_sprites" from there, (returning the value
+	of the GameState's "loop_end()", as Game._end_loop() does). Alternatively, you
 	could call "notify_sprites" in a GameState's "loop_end" function. The only
 	drawback to the second method is that you need to make sure that this call is
 	made from every GameState which needs it.
@@ -109,6 +110,9 @@ class Neighborhood:
 	sprite's "kill" function.
 	"""
 
+	notify_interval = 1		# Only notify sprites every this many calls; see pacing.FramePacer
+	_notify_skipped = 0
+
 	def __init__(self, rect, cells_x, cells_y):
 		"""
 		Set the area to be watched by this Neighborhood.
@@ -214,11 +218,24 @@ class Neighborhood:
 		"""
 		self._observed_sprites_list.remove(sprite)
 
+	def is_observing(self, sprite):
+		"""
+		Returns True if the given sprite is being observed.
+		"""
+		return sprite in self._observed_sprites_list
+
 	def notify_sprites(self):
 		"""
 		Re-calculate quadrant membership of all the sprites observed and notify the observed sprites
 		when another observed sprite is within the same quadrant.
+
+		When "notify_interval" is more than 1, this only does anything every "notify_interval" calls.
 		"""
+		if self.notify_interval > 1:
+			self._notify_skipped += 1
+			if self._notify_skipped < self.notify_interval:
+				return
+			self._notify_skipped = 0
 		for quadrant in self._quadrants:
 			quadrant.sprites.clear()
 		for sprite in self._observed_sprites_list:
@@ -20,7 +20,7 @@
 """
 Provides the NetworkGame class, a framework for games played over a network.
 """
-import importlib
+import importlib, asyncio
 from time import time
 from legame.game import Game, GameState
 from legame.joiner import BroadcastJoiner, DirectJoiner
@@ -38,6 +38,10 @@ class NetworkGame(Game):
 
 	Message transport selection is up to you. The current options are "json" and "byte".
 	See the cable_car docs for more info on message transports.
+
+	When started using "run_async()", the messenger is serviced by an asyncio Task
+	every "xfer_interval" seconds, instead of at the end of the main loop, and
+	GameState "handle_message()" functions may be coroutines.
 	"""
 
 	udp_port		= 8222		# Port to broadcast on
@@ -82,30 +86,85 @@ class NetworkGame(Game):
 			self.__joiner = BroadcastJoiner(options)
 
 	def run(self):
+		"""
+		Shows the joiner dialog, then, once connected, runs the game; see Game.run().
+		"""
+		if not self._join():
+			return 5
+		try:
+			return Game.run(self)
+		except Exception as e:
+			self._quit()
+			return 1
+
+	def run_async(self):
+		"""
+		Shows the joiner dialog, then, once connected, runs the game in an asyncio
+		event loop; see Game.run_async().
+		"""
+		if not self._join():
+			return 5
+		try:
+			return Game.run_async(self)
+		except Exception as e:
+			self._quit()
+			return 1
+
+	def _join(self):
+		"""
+		Shows the joiner dialog. Returns True when connected.
+		"""
 		self.__joiner.show()
-		if not self.__joiner.messenger: return 5
+		if not self.__joiner.messenger: return False
 		self.messenger = self.__joiner.messenger
 		del self.__joiner
 		self._next_xfer = time()
+		return True
+
+	def _quit(self):
+		self.messenger.send(MsgQuit())
+		self.messenger.shutdown()
+
+	async def _run_async(self):
+		"""
+		Services the messenger in an asyncio Task while the main loop runs.
+		"""
+		xfer = asyncio.get_running_loop().create_task(self._xfer_async())
+		await Game._run_async(self)
+		if xfer.done():
+			xfer.result()		# Raises the exception which stopped the Task
+		xfer.cancel()
+
+	async def _xfer_async(self):
 		try:
-			return Game.run(self)
-		except Exception as e:
-			self.messenger.send(MsgQuit())
-			self.messenger.shutdown()
-			return 1
+			while True:
+				self._xfer()
+				await asyncio.sleep(self.xfer_interval)
+		except Exception:
+			self.shutdown()
+			raise
+
+	def _xfer(self):
+		"""
+		Sends and receives messages, passing each message received to the current
+		GameState's "handle_message()".
+		"""
+		self.messenger.xfer()
+		message = self.messenger.get()
+		while message is not None:
+			self._start_coroutine(self._state.handle_message(message))
+			message = self.messenger.get()
 
 	def _end_loop(self):
 		"""
-		Called at the end of the _main_loop(), this function handles message transfer.
+		Called at the end of the _main_loop(), this function handles message transfer,
+		unless it is done by the Task started in "_run_async()".
 		"""
-		self._state.loop_end()
-		if time() >= self._next_xfer:
+		result = self._state.loop_end()
+		if not self._async and time() >= self._next_xfer:
 			self._next_xfer = time() + self.xfer_interval
-			self.messenger.xfer()
-			message = self.messenger.get()
-			while message is not None:
-				self._state.handle_message(message)
-				message = self.messenger.get()
+			self._xfer()
+		return result
 
 # Dynamically append "handle_message" method used by NetworkGame to the GameState class:
 
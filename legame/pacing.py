@@ -0,0 +1,147 @@
+#  legame/pacing.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the FramePacer class, which lowers the quality of a Game when frames
+take longer than the frame rate allows, and raises it again when they don't.
+
+The Game creates a FramePacer when its "adaptive_quality" option is set, and
+calls its "initial_pacing()" function to register the ways quality may be
+lowered, (fallbacks), in the order they should be used. i.e.:
+
+	class MyGame(Game):
+
+		adaptive_quality = True
+
+		def initial_pacing(self, pacer):
+			pacer.add_attribute(Flipper, "flip_interval", 2)		# Animate at half speed
+			pacer.add_attribute(self.neighborhood, "notify_interval", 3)
+			pacer.add_layer(self.sprites, self.LAYER_BG)			# Stop updating the background
+			pacer.add_attribute(self, "render_interval", 2)		# Draw every other frame
+
+A fallback is any pair of functions; one which lowers quality and one which
+restores it. The first fallback is used first, and restored last.
+"""
+import logging
+from collections import deque
+from functools import partial
+
+
+class FramePacer:
+	"""
+	Measures how long each frame takes to run, (not counting the time spent waiting
+	for the next frame), and compares the average against the time allowed for each
+	frame at the game's frame rate, (the "budget").
+
+	When the average is over "degrade_above" of the budget, the next fallback is
+	applied. When the average is under "restore_below" of the budget, the last
+	fallback applied is restored. After each change, nothing more is changed until
+	"settle_frames" frames have passed and "sample_frames" new frames have been
+	measured, so that the effect of the change can be seen.
+	"""
+
+	degrade_above		= 1.0		# Fraction of the budget which, when exceeded, lowers quality
+	restore_below		= 0.6		# Fraction of the budget below which quality is restored
+	sample_frames		= 30		# Number of frames averaged
+	settle_frames		= 30		# Frames ignored after each change
+
+	def __init__(self, fps):
+		"""
+		"fps" is the frame rate to keep up with.
+		"""
+		self.budget_ms = 1000.0 / fps
+		self.level = 0				# Number of fallbacks applied
+		self._fallbacks = []		# (degrade, restore) function pairs
+		self._costs = deque(maxlen = self.sample_frames)
+		self._settle = 0
+
+	def __len__(self):
+		"""
+		Returns the number of fallbacks registered.
+		"""
+		return len(self._fallbacks)
+
+	def add(self, degrade, restore):
+		"""
+		Registers a fallback; "degrade" is called with no arguments to lower quality,
+		and "restore" to raise it again.
+		"""
+		self._fallbacks.append((degrade, restore))
+
+	def add_attribute(self, target, name, value):
+		"""
+		Registers a fallback which sets an attribute of "target", (an object or a
+		class), to "value", and restores its previous value.
+		"""
+		saved = []
+		def degrade():
+			saved.append(getattr(target, name))
+			setattr(target, name, value)
+		def restore():
+			setattr(target, name, saved.pop())
+		self.add(degrade, restore)
+
+	def add_layer(self, group, layer):
+		"""
+		Registers a fallback which puts all the sprites in one layer of a
+		SleepingUpdates group to sleep, and wakes them when restored.
+		"""
+		self.add(partial(group.sleep_layer, layer), partial(group.wake_layer, layer))
+
+	def update(self, cost_ms):
+		"""
+		Called by the Game at the end of every frame, with the number of milliseconds
+		the frame took to run. Applies or restores a fallback when necessary.
+		"""
+		if self._settle:
+			self._settle -= 1
+			return
+		costs = self._costs
+		costs.append(cost_ms)
+		if len(costs) < costs.maxlen:
+			return
+		average = sum(costs) / len(costs)
+		if average > self.budget_ms * self.degrade_above:
+			if self.level < len(self._fallbacks):
+				self._fallbacks[self.level][0]()
+				self.level += 1
+				logging.debug("Frames averaging %.1f ms; lowered quality to level %d", average, self.level)
+				self._changed()
+		elif average < self.budget_ms * self.restore_below:
+			if self.level:
+				self.level -= 1
+				self._fallbacks[self.level][1]()
+				logging.debug("Frames averaging %.1f ms; raised quality to level %d", average, self.level)
+				self._changed()
+
+	def restore_all(self):
+		"""
+		Restores every fallback applied.
+		"""
+		while self.level:
+			self.level -= 1
+			self._fallbacks[self.level][1]()
+		self._changed()
+
+	def _changed(self):
+		self._costs.clear()
+		self._settle = self.settle_frames
+
+
+#  end legame/pacing.py
@@ -0,0 +1,166 @@
+#  legame/pool.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the SpritePool class and the Pooled sprite mixin, which allow sprites
+which are killed to be reused instead of creating new ones.
+"""
+from legame.sprite_enhancement import BaseCenteredSprite, BaseMovingSprite
+
+
+class SpritePool:
+	"""
+	Keeps killed sprites of one class so that they can be reused.
+
+	Games which constantly create and kill sprites, (bullets, particles, etc.),
+	spend a lot of time allocating and garbage-collecting them. Using a pool,
+	sprites are created with "acquire()" instead of the class constructor. When a
+	Pooled sprite is killed, it goes back into the pool, and the next call to
+	"acquire()" returns it, after calling its "reset()" function.
+
+	e.g.:
+
+		class Bullet(Pooled, MovingSprite, Sprite):
+
+			def __init__(self, x, y, direction):
+				MovingSprite.__init__(self, x, y, self.speed, direction)
+				Sprite.__init__(self, Game.current.sprites)
+				Game.current.sprites.change_layer(self, Game.LAYER_PLAYER)
+				self.image = ...
+
+			def reset(self, x, y, direction):
+				self.reset_motion(x, y, self.speed, direction)
+
+		bullets = SpritePool(Bullet)
+		bullets.acquire(x, y, direction)
+
+	When a sprite is returned to the pool, the groups it was in, its layer in each
+	LayeredUpdates group, and whether it was observed by the pool's "neighborhood"
+	are remembered. These are restored when the sprite is reused, so "reset()"
+	only needs to reinitialize the sprite itself; i.e. call "reset_motion()" and
+	"flip()".
+	"""
+
+	def __init__(self, sprite_class, neighborhood = None, limit = None):
+		"""
+		"sprite_class" is the class of sprite to create. It must inherit Pooled, and
+		either implement "reset()" or inherit CenteredSprite or MovingSprite.
+		"neighborhood" is an optional Neighborhood which the sprites are observed by.
+		"limit" is the maximum number of unused sprites to keep. When not given, all
+		of the sprites released are kept.
+		"""
+		if not issubclass(sprite_class, Pooled):
+			raise TypeError("%s must inherit Pooled" % sprite_class.__name__)
+		if sprite_class.reset is Pooled.reset and not issubclass(sprite_class, BaseCenteredSprite):
+			raise TypeError("%s must implement reset()" % sprite_class.__name__)
+		self.sprite_class = sprite_class
+		self.neighborhood = neighborhood
+		self.limit = limit
+		self._free = []		# (sprite, [(group, layer), ...], observed) of unused sprites
+
+	def __len__(self):
+		"""
+		Returns the number of unused sprites in the pool.
+		"""
+		return len(self._free)
+
+	def acquire(self, *args, **kwargs):
+		"""
+		Returns a sprite from the pool, reset using the given arguments, or, if the
+		pool is empty, a new sprite constructed using the given arguments.
+		"""
+		if not self._free:
+			sprite = self.sprite_class(*args, **kwargs)
+			sprite.pool = self
+			return sprite
+		sprite, memberships, observed = self._free.pop()
+		sprite.in_pool = False
+		sprite.reset(*args, **kwargs)
+		for group, layer in memberships:
+			if layer is None:
+				group.add(sprite)
+			else:
+				group.add(sprite, layer = layer)
+		if observed:
+			self.neighborhood.observe(sprite)
+		return sprite
+
+	def release(self, sprite):
+		"""
+		Removes the given sprite from all groups, (by calling the "kill()" function of
+		the sprite's class), and keeps it for reuse. Called by Pooled.kill().
+		"""
+		if sprite.in_pool:
+			return
+		memberships = [ (group, group.get_layer_of_sprite(sprite) \
+			if hasattr(group, "get_layer_of_sprite") else None) \
+			for group in sprite.groups() ]
+		observed = self.neighborhood is not None and self.neighborhood.is_observing(sprite)
+		super(Pooled, sprite).kill()
+		if observed and self.neighborhood.is_observing(sprite):
+			self.neighborhood.ignore(sprite)
+		sprite.in_pool = True
+		if self.limit is None or len(self._free) < self.limit:
+			self._free.append((sprite, memberships, observed))
+
+
+class Pooled:
+	"""
+	A mixin for sprites which are kept in a SpritePool. Killing a Pooled sprite
+	returns it to the pool it was acquired from.
+
+	Pooled must come before pygame.sprite.Sprite, (and any other class which
+	defines "kill()"), in the list of base classes, so that its "kill()" is used.
+	"""
+
+	pool				= None		# The SpritePool which created this sprite
+	in_pool				= False		# True while unused, waiting in the pool
+
+	def kill(self):
+		"""
+		Returns this sprite to its pool. If this sprite was not acquired from a pool,
+		it is simply killed.
+		"""
+		if self.pool is None:
+			super().kill()
+		else:
+			self.pool.release(self)
+
+	def reset(self, *args, **kwargs):
+		"""
+		Called by SpritePool.acquire() when reusing this sprite, with the arguments
+		passed to "acquire()", (the same as the arguments of the constructor).
+
+		Override this to put the sprite back into its initial state, without creating
+		new objects. See CenteredSprite.reset_position(), MovingSprite.reset_motion()
+		and Flipper.flip().
+
+		The default calls "reset_motion()" of a MovingSprite, or "reset_position()" of
+		a CenteredSprite, with the arguments given, which is enough for sprites whose
+		constructor takes the same arguments as those.
+		"""
+		if isinstance(self, BaseMovingSprite):
+			self.reset_motion(*args, **kwargs)
+		elif isinstance(self, BaseCenteredSprite):
+			self.reset_position(*args, **kwargs)
+		else:
+			raise TypeError("%s must implement reset()" % type(self).__name__)
+
+
+#  end legame/pool.py
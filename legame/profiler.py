@@ -0,0 +1,130 @@
+#  legame/profiler.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the FrameProfiler class, which times each phase of Game._main_loop().
+"""
+import csv, json, logging
+from collections import deque
+from math import ceil
+from time import perf_counter
+
+
+class FrameProfiler:
+	"""
+	Keeps the time spent in each phase of the main loop for the last "frames"
+	frames, and calculates percentiles from these.
+
+	The Game creates a FrameProfiler when its "profile" option is set. The phases
+	timed are, in order:
+
+		loop_start		GameState.loop_start()
+		events			event dispatch (keyboard, mouse, timers, tasks)
+		loop_end		Game._end_loop(), which calls GameState.loop_end()
+		update			sprites.update(), and MotionEngine.step() when used
+		clear			sprites.clear()
+		draw			sprites.draw()
+		display			pygame.display.update(), and copying the frame when capturing
+
+	All times are kept in milliseconds.
+	"""
+
+	phases				= ("loop_start", "events", "loop_end", "update", "clear", "draw", "display")
+	percentile_points	= (50, 95, 99)
+
+	def __init__(self, frames = 300):
+		"""
+		"frames" is the number of frames to keep samples for.
+		"""
+		self.frames = frames
+		self.samples = { phase: deque(maxlen = frames) for phase in self.phases }
+		self._mark = 0.0
+
+	def start(self):
+		"""
+		Marks the beginning of a frame. Called before "loop_start".
+		"""
+		self._mark = perf_counter()
+
+	def lap(self, phase):
+		"""
+		Records the time elapsed since the last call to "start()" or "lap()" as the
+		time taken by the given phase.
+		"""
+		now = perf_counter()
+		self.samples[phase].append((now - self._mark) * 1000.0)
+		self._mark = now
+
+	def percentiles(self, phase):
+		"""
+		Returns a dict of { "p50": <ms>, "p95": <ms>, "p99": <ms> } for the given phase,
+		using the nearest-rank method. Returns an empty dict if there are no samples.
+		"""
+		samples = sorted(self.samples[phase])
+		if not samples:
+			return {}
+		count = len(samples)
+		return { "p%d" % point: samples[max(0, ceil(point / 100 * count) - 1)] \
+			for point in self.percentile_points }
+
+	def report(self):
+		"""
+		Returns a dict of percentiles for each phase, keyed on phase name.
+		"""
+		return { phase: self.percentiles(phase) for phase in self.phases }
+
+	def rows(self):
+		"""
+		Returns a list of per-frame samples, with one value for each phase.
+		"""
+		return [ list(row) for row in zip(*(self.samples[phase] for phase in self.phases)) ]
+
+	def dump(self, filename):
+		"""
+		Writes the samples to the given file. The format is chosen by the file
+		extension; ".json" writes JSON, anything else writes CSV.
+		"""
+		if filename.lower().endswith(".json"):
+			self.dump_json(filename)
+		else:
+			self.dump_csv(filename)
+		logging.debug("Wrote frame profile to %s", filename)
+
+	def dump_csv(self, filename):
+		"""
+		Writes one row per frame, with one column per phase, in milliseconds.
+		"""
+		with open(filename, "w", newline = "") as fh:
+			writer = csv.writer(fh)
+			writer.writerow(self.phases)
+			writer.writerows(self.rows())
+
+	def dump_json(self, filename):
+		"""
+		Writes the percentiles of each phase, and the samples for each phase.
+		"""
+		with open(filename, "w") as fh:
+			json.dump({
+				"frames": len(self.samples[self.phases[0]]),
+				"percentiles": self.report(),
+				"samples": { phase: list(self.samples[phase]) for phase in self.phases }
+			}, fh, indent = "\t")
+
+
+#  end legame/profiler.py
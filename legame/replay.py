@@ -0,0 +1,148 @@
+#  legame/replay.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the Recording class, used by the Game to record a play session and
+replay it later, exactly, without any real input.
+
+To record, set the "record_file" option of the Game. Everything which makes one
+run of a game different from another is saved to that file when the game exits:
+
+	the random seed
+	the events handled on each frame
+	the timers set with "set_timeout()" or "set_interval()" which fired on each frame
+	the number of milliseconds each frame took, (which decides how many updates are
+	done per frame when using a fixed timestep)
+
+To replay, set the "replay_file" option. The game runs headless, as fast as
+possible, for as many frames as were recorded. Replaying a recording using the
+benchmark module gives a repeatable benchmark of a real play session:
+
+	python -m legame.benchmark mygame:MyGame --replay session.replay
+
+Only input which arrives as events is replayed. A game which polls the mouse or
+keyboard directly, (i.e. pygame.mouse.get_pos()), will not behave the same
+when replayed.
+"""
+import gzip, json, logging
+from pygame.event import Event
+
+# Types of event attribute values which are kept in a recording. Other values,
+# (i.e. the "window" attribute of window events), are dropped.
+_PLAIN_TYPES = (bool, int, float, str, tuple, list, type(None))
+
+
+class Recording:
+	"""
+	The events, timer firings and frame times of a play session, frame by frame.
+
+	Each frame is a tuple of (events, timers, milliseconds), where "events" is a
+	list of (type, attributes) tuples, "timers" is a list of the timer handles
+	which fired, (relative to "handle_base"), and "milliseconds" is the time the
+	frame took.
+
+	Recordings are saved as gzip-compressed JSON, so loading one never runs any
+	code. JSON has no tuples, so tuple attributes, (i.e. "pos"), are saved as
+	lists and turned back into tuples when loaded.
+	"""
+
+	version				= 2
+
+	def __init__(self, seed, handle_base):
+		"""
+		"seed" is the value the random number generator was seeded with.
+		"handle_base" is the first timer handle issued during the session, so that
+		recorded handles can be matched to the timers set when replaying.
+		"""
+		self.seed = seed
+		self.handle_base = handle_base
+		self.frames = []
+		self._position = 0
+
+	def __len__(self):
+		"""
+		Returns the number of frames recorded.
+		"""
+		return len(self.frames)
+
+	def record(self, events, timers, milliseconds):
+		"""
+		Appends one frame to this Recording.
+		"""
+		base = self.handle_base
+		self.frames.append((
+			[ (event.type, { key:value for key, value in event.dict.items() \
+				if isinstance(value, _PLAIN_TYPES) }) for event in events ],
+			[ handle - base for handle in timers ],
+			milliseconds
+		))
+
+	def play(self, handle_base):
+		"""
+		Returns the next frame as a tuple of (events, timers, milliseconds), with
+		the events as pygame Event objects, and the timer handles matched to the ones
+		issued starting with "handle_base". Returns None after the last frame.
+		"""
+		if self._position >= len(self.frames):
+			return None
+		events, timers, milliseconds = self.frames[self._position]
+		self._position += 1
+		return (
+			[ Event(event_type, attributes) for event_type, attributes in events ],
+			[ handle_base + offset for offset in timers ],
+			milliseconds
+		)
+
+	def save(self, filename):
+		"""
+		Writes this Recording to a gzip-compressed JSON file.
+		"""
+		with gzip.open(filename, "wt", encoding = "utf-8") as fh:
+			json.dump({
+				"version"		: self.version,
+				"seed"			: self.seed,
+				"handle_base"	: self.handle_base,
+				"frames"		: self.frames
+			}, fh)
+		logging.debug("Saved %d frames to %s", len(self.frames), filename)
+
+	@classmethod
+	def load(cls, filename):
+		"""
+		Returns a Recording read from a file written by "save()".
+		Raises ValueError if the file is not a recording, was written by an
+		incompatible version, or has no frames.
+		"""
+		with gzip.open(filename, "rt", encoding = "utf-8") as fh:
+			data = json.load(fh)
+		if not isinstance(data, dict) or data.get("version") != cls.version:
+			raise ValueError("%s is not a version %d recording" % (filename, cls.version))
+		if not data["frames"]:
+			raise ValueError("%s has no frames" % filename)
+		recording = cls(data["seed"], data["handle_base"])
+		recording.frames = [ (
+			[ (event_type, { key:(tuple(value) if isinstance(value, list) else value) \
+				for key, value in attributes.items() }) for event_type, attributes in events ],
+			timers,
+			milliseconds
+		) for events, timers, milliseconds in data["frames"] ]
+		return recording
+
+
+#  end legame/replay.py
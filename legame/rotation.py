@@ -0,0 +1,134 @@
+#  legame/rotation.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the RotationCache class, which keeps rotated copies of images so that
+they are not rotated again every frame, and the Rotating sprite mixin, which
+shows an image turned to face the sprite's "direction".
+"""
+from collections import OrderedDict
+import pygame
+
+
+class RotationCache:
+	"""
+	Keeps images rotated to angles which are a multiple of "step" degrees, dropping
+	the least recently used when there are more than "limit".
+
+	Angles are in the same screen degrees as MovingSprite.direction; 0 is to the
+	right, and 90 is down. An image drawn pointing to the right is returned
+	pointing in the direction given. i.e.:
+
+		cache = RotationCache(step = 5)
+		sprite.image = cache.rotated(arrow, sprite.direction)
+
+	Images are kept by identity, so the same Surface, (such as an ImageSet frame),
+	must be passed every time for the cached copies to be used.
+	"""
+
+	def __init__(self, step = 3.0, limit = 1024):
+		"""
+		"step" is the number of degrees between the angles kept; smaller steps look
+		smoother and use more memory. "limit" is the most rotated images to keep.
+		"""
+		self.steps = max(1, round(360 / step))
+		self.step = 360 / self.steps
+		self.limit = limit
+		self.hits = 0
+		self.misses = 0
+		self._images = OrderedDict()	# (image, step number): rotated image
+
+	def __len__(self):
+		"""
+		Returns the number of rotated images kept.
+		"""
+		return len(self._images)
+
+	def rotated(self, image, direction):
+		"""
+		Returns "image" turned from pointing right to point in "direction", rounded to
+		the nearest "step".
+		"""
+		key = (image, round(direction / self.step) % self.steps)
+		rotated = self._images.get(key)
+		if rotated is None:
+			self.misses += 1
+			rotated = pygame.transform.rotate(image, -key[1] * self.step)
+			self._images[key] = rotated
+			if len(self._images) > self.limit:
+				self._images.popitem(last = False)
+		else:
+			self.hits += 1
+			self._images.move_to_end(key)
+		return rotated
+
+	def preload(self, image):
+		"""
+		Rotates "image" to every angle, so that there is no delay the first time each
+		angle is used.
+		"""
+		for index in range(self.steps):
+			self.rotated(image, index * self.step)
+
+	def clear(self):
+		"""
+		Drops all the rotated images.
+		"""
+		self._images.clear()
+
+
+class Rotating:
+	"""
+	A mixin for MovingSprites which show an image turned to face their "direction".
+
+	Set "base_image", (drawn pointing to the right), and call "rotate_image()" from
+	"update()" after moving. i.e.:
+
+		class Arrow(Rotating, MovingSprite, Sprite):
+
+			def update(self):
+				self.turn_towards(self.target.position)
+				MovingSprite.update(self)
+				self.rotate_image()
+
+	The rotated images are larger than the base image, (except at right angles), so
+	the "rect" is resized to the rotated image, keeping its center.
+
+	All Rotating sprites share one RotationCache unless a class sets its own
+	"rotation_cache".
+	"""
+
+	base_image			= None					# The image pointing to the right, (0 degrees)
+	rotation_cache		= RotationCache()		# Shared by every class which does not set its own
+
+	def rotate_image(self, image = None):
+		"""
+		Sets "image" to "image", (or "base_image" when not given), rotated to this
+		sprite's direction, and resizes "rect" to fit it.
+		"""
+		if image is None:
+			image = self.base_image
+		self.image = self.rotation_cache.rotated(image, self.direction)
+		center = self.rect.center
+		self.rect.size = self.image.get_size()
+		self.rect.center = center
+		return self
+
+
+#  end legame/rotation.py
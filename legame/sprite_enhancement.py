@@ -23,7 +23,9 @@ Provides classes for easier positioning and moving of sprites.
 import math
 from pygame import Rect
 from pygame.math import Vector2 as Vector
-from legame import	triangular, turning_degrees, \
+from legame.sprite_groups import wake
+from legame.kinematics import stopping_distance
+from legame import	turning_degrees, \
 					OFFSCREEN_LEFT, OFFSCREEN_TOP, OFFSCREEN_RIGHT, OFFSCREEN_BOTTOM, \
 					COMPASS_WEST, COMPASS_NORTH, COMPASS_EAST, COMPASS_SOUTH, \
 					SIDE_LEFT, SIDE_TOP, SIDE_RIGHT, SIDE_BOTTOM
@@ -34,7 +36,7 @@ def to_vector(target):
 	Returns a Vector from the given tuple, Vector, or CenteredSprite.
 	Raises ValueError if impossible to convert.
 	"""
-	if isinstance(target, CenteredSprite):
+	if isinstance(target, BaseCenteredSprite):
 		return target.position
 	if isinstance(target, Vector):
 		return target
@@ -43,7 +45,13 @@ def to_vector(target):
 	raise ValueError("Invalid target: %s" % target)
 
 
-class CenteredSprite:
+class BaseCenteredSprite:
+	"""
+	The functions shared by CenteredSprite and CompactCenteredSprite. Has no
+	attributes of its own; inherit one of those instead.
+	"""
+
+	__slots__			= ()
 
 	height				= 10
 	width				= 10
@@ -103,12 +111,38 @@ class CenteredSprite:
 		self.rect.centery = int(self.position.y)
 		return self
 
+	def reset_position(self, x = 0.0, y = 0.0):
+		"""
+		Moves this CenteredSprite to the given x/y position, reusing the existing
+		"position" vector and "rect". Used when reusing a sprite; see pool.SpritePool.
+		"""
+		self.position.update(x, y)
+		return self.update_rect()
+
 
-class MovingSprite(CenteredSprite):
+class CenteredSprite(BaseCenteredSprite):
 	"""
-	A class compatible with pygame.Sprite which tracks position, motion, rotation in 2d space.
+	A class compatible with pygame.Sprite which is positioned using its center point.
+	"""
+
+
+class CompactCenteredSprite(BaseCenteredSprite):
+	"""
+	A CenteredSprite which keeps its "position" and "rect" in __slots__; see
+	CompactMovingSprite.
+	"""
+
+	__slots__			= ("position", "rect")
+
+
+class BaseMovingSprite(BaseCenteredSprite):
+	"""
+	The functions shared by MovingSprite and CompactMovingSprite. Has no
+	attributes of its own; inherit one of those instead.
 	"""
 
+	__slots__			= ()
+
 	max_speed			= 100.0	# Absolute speed limit for this thing
 	min_speed			= 0.5	# ...and the slowest its allowed to go
 	accel_rate			= 1.0	# Value added to speed each frame when accelerating
@@ -118,6 +152,7 @@ class MovingSprite(CenteredSprite):
 	destination			= None  # Necessary for seek_motion
 	_motion_function	= None	# Function called to move this on Sprite.update()
 	_arrival_function	= None	# Function called when destination reached by seeking motion
+	previous_position	= None	# (x, y) before the last update, kept for interpolate()
 
 	def __init__(self, x = 0.0, y = 0.0, speed = None, direction = None):
 		"""
@@ -137,7 +172,7 @@ class MovingSprite(CenteredSprite):
 					self._motion_function = self.cartesian_motion	# (example)
 
 		"""
-		CenteredSprite.__init__(self, x, y)
+		BaseCenteredSprite.__init__(self, x, y)
 		self._motion_function = self.cartesian_motion
 		self.motion = Vector()
 		if speed is None or direction is None: return
@@ -196,6 +231,52 @@ class MovingSprite(CenteredSprite):
 		self.rect.centery = int(self.position.y)
 		return self
 
+	def reset_motion(self, x = 0.0, y = 0.0, speed = None, direction = None):
+		"""
+		Puts this MovingSprite back into the state it was in when constructed with the
+		same arguments, reusing the existing "position" and "motion" vectors. Used when
+		reusing a sprite; see pool.SpritePool.
+		"""
+		self.reset_position(x, y)
+		self.motion.update(0.0, 0.0)
+		if speed is not None and direction is not None:
+			self.motion.from_polar((speed, direction))
+		self._motion_function = self.cartesian_motion
+		self._arrival_function = None
+		self.destination = None
+		self.turning_speed = 0.0
+		self.previous_position = None
+		return self
+
+	def interpolate(self, alpha):
+		"""
+		Places the "rect" part way between the position kept by "remember_position()"
+		and the current position. "alpha" is the fraction of a step to show, (0.0 to
+		1.0), where 1.0 is the current position. Places the "rect" at the current
+		position when no position was kept.
+
+		Called from Game._main_loop() when using a fixed timestep. The position vector
+		is not changed, so the next motion step will pick up from the true position.
+		"""
+		x, y = self.position.x, self.position.y
+		previous = self.previous_position
+		if previous is not None:
+			lag = 1.0 - alpha
+			x -= (x - previous[0]) * lag
+			y -= (y - previous[1]) * lag
+		self.rect.centerx = int(x)
+		self.rect.centery = int(y)
+		return self
+
+	def remember_position(self):
+		"""
+		Keeps the current position for "interpolate()". Called from Game._main_loop()
+		before the last update of each frame, so that moves of any kind, (shifts,
+		jumps, arrival at a destination), are drawn from where the sprite really was.
+		"""
+		self.previous_position = (self.position.x, self.position.y)
+		return self
+
 	def set_motion_polar(self, magnitude, degrees):
 		"""
 		Set the current motion vector from the given magnitude, degrees.
@@ -211,6 +292,7 @@ class MovingSprite(CenteredSprite):
 		self.destination = to_vector(target)
 		self._motion_function = self.seek_motion
 		self._arrival_function = on_arrival
+		wake(self)
 		return self.make_heading()
 
 	def make_heading(self):
@@ -276,7 +358,7 @@ class MovingSprite(CenteredSprite):
 			self._motion_function = self.no_motion
 			if self._arrival_function:
 				self._arrival_function()
-		elif remaining_distance <= triangular(self.speed, self.decel_rate):
+		elif remaining_distance <= stopping_distance(self.speed, self.decel_rate):
 			# coming up on target_pos; decelerate:
 			self.speed = max(self.min_speed, self.speed - self.decel_rate)
 		else:
@@ -444,6 +526,65 @@ class MovingSprite(CenteredSprite):
 			(type(self).__name__, self.position.x, self.position.y, self.motion.degrees, self.motion.magnitude())
 
 
+class MovingSprite(BaseMovingSprite, CenteredSprite):
+	"""
+	A class compatible with pygame.Sprite which tracks position, motion, rotation in 2d space.
+	"""
+
+
+class CompactMovingSprite(BaseMovingSprite, CompactCenteredSprite):
+	"""
+	A MovingSprite which keeps its attributes in __slots__ instead of a __dict__,
+	making it smaller and its attributes faster to access. Attributes which are not
+	in __slots__ cannot be set, so a subclass must declare any attributes of its
+	own in "__slots__", i.e.:
+
+		class Particle(CompactMovingSprite):
+			__slots__ = ("age",)
+
+	pygame.sprite.Sprite has no __slots__, so a class which inherits both this and
+	Sprite still has a __dict__, but it holds only the attributes which Sprite sets.
+	See examples/compact-sprites.py for a comparison.
+	"""
+
+	__slots__			= ("motion", "turning_speed", "destination",
+							"_motion_function", "_arrival_function", "previous_position")
+
+	def __init__(self, x = 0.0, y = 0.0, speed = None, direction = None):
+		"""
+		The same as MovingSprite.__init__(). Slots have no defaults, so every one of
+		them is set here.
+
+		"_motion_function" is None while moving using "cartesian_motion()", rather
+		than a bound method, which would take more memory than the rest of the sprite.
+		"""
+		self.turning_speed = 0.0
+		self.destination = None
+		self._arrival_function = None
+		self.previous_position = None
+		BaseMovingSprite.__init__(self, x, y, speed, direction)
+		self._motion_function = None
+
+	def update(self):
+		"""
+		Regular cyclic update task, as called from pygame.Sprite.
+		Calls the current move function, or "cartesian_motion" if there is none.
+		"""
+		motion_function = self._motion_function
+		if motion_function is None:
+			self.cartesian_motion()
+		else:
+			motion_function()
+
+	def reset_motion(self, x = 0.0, y = 0.0, speed = None, direction = None):
+		"""
+		The same as MovingSprite.reset_motion(); see pool.SpritePool.
+		"""
+		BaseMovingSprite.reset_motion(self, x, y, speed, direction)
+		self._motion_function = None
+		return self
+
+
 class BoxedInSprite:
 	"""
 	A class which can add boundary checking to a MovingSprite.
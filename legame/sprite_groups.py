@@ -0,0 +1,225 @@
+#  legame/sprite_groups.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides sprite groups which may be used as the Game "sprites" group in place of
+pygame.sprite.LayeredUpdates.
+"""
+from pygame.sprite import LayeredUpdates
+
+
+def sleep(sprite):
+	"""
+	Puts the given sprite to sleep. A sleeping sprite is still drawn, but is skipped
+	when a SleepingUpdates group updates its sprites.
+
+	Sprites are woken by "wake()", which is called by MovingSprite.travel_to() and
+	Flipper.flip().
+	"""
+	sprite.sleeping = True
+	for group in _groups(sprite):
+		if isinstance(group, SleepingUpdates):
+			group._awake = None
+
+
+def wake(sprite):
+	"""
+	Wakes the given sprite, if sleeping, so that it is updated again.
+	"""
+	if getattr(sprite, "sleeping", False):
+		sprite.sleeping = False
+		for group in _groups(sprite):
+			if isinstance(group, SleepingUpdates):
+				group._awake = None
+
+
+def merge_rects(rects):
+	"""
+	Returns a list of Rects which cover the same area as the given "rects", with
+	every group of overlapping Rects replaced by their union. The Rects given may
+	be modified.
+	"""
+	merged = []
+	for rect in rects:
+		index = rect.collidelist(merged)
+		while index >= 0:
+			rect.union_ip(merged.pop(index))
+			index = rect.collidelist(merged)
+		merged.append(rect)
+	return merged
+
+
+
+def _groups(sprite):
+	"""
+	Returns the groups the given sprite is in. Mixins such as MovingSprite may be
+	used without pygame.sprite.Sprite, in which case there are none.
+	"""
+	return sprite.groups() if hasattr(sprite, "groups") else ()
+
+
+class SleepingUpdates(LayeredUpdates):
+	"""
+	A LayeredUpdates group which does not call "update()" on sleeping sprites, nor
+	on any of the sprites in a sleeping layer. Sleeping sprites are still drawn.
+
+	Put sprites which have nothing to do, (i.e. pieces sitting on a game board), to
+	sleep using "sleep()", and whole layers, (i.e. a background which never
+	changes), to sleep using "sleep_layer()".
+
+	This is the group the Game uses for its "sprites", unless otherwise configured.
+	The other groups in this module and in camera.py are derived from it.
+	"""
+
+	def __init__(self, *sprites, **kwargs):
+		LayeredUpdates.__init__(self, *sprites, **kwargs)
+		self._sleeping_layers = set()
+		self._awake = None			# Cached list of the sprites to update
+
+	def add_internal(self, sprite, layer = None):
+		LayeredUpdates.add_internal(self, sprite, layer)
+		self._awake = None
+
+	def remove_internal(self, sprite):
+		LayeredUpdates.remove_internal(self, sprite)
+		self._awake = None
+
+	def change_layer(self, sprite, new_layer):
+		LayeredUpdates.change_layer(self, sprite, new_layer)
+		self._awake = None
+
+	def sleep_layer(self, layer):
+		"""
+		Stops updating the sprites in the given layer.
+		"""
+		self._sleeping_layers.add(layer)
+		self._awake = None
+
+	def wake_layer(self, layer):
+		"""
+		Resumes updating the sprites in the given layer, (except for sleeping sprites).
+		"""
+		self._sleeping_layers.discard(layer)
+		self._awake = None
+
+	def awake_sprites(self):
+		"""
+		Returns a list of the sprites which are updated; those which are not sleeping,
+		and are not in a sleeping layer.
+		"""
+		if self._awake is None:
+			layers, sleeping_layers = self._spritelayers, self._sleeping_layers
+			self._awake = [ sprite for sprite in self.sprites() \
+				if not getattr(sprite, "sleeping", False) and layers[sprite] not in sleeping_layers ]
+		return self._awake
+
+	def update(self, *args, **kwargs):
+		"""
+		Calls "update()" on each of the sprites which are awake.
+		"""
+		for sprite in self.awake_sprites():
+			sprite.update(*args, **kwargs)
+
+
+class DirtyUpdates(SleepingUpdates):
+	"""
+	A LayeredUpdates group which only redraws the parts of the screen which changed.
+
+	A sprite is "dirty" when its "rect" has moved or changed size, or its "image"
+	was replaced by a different Surface, since the last time it was drawn. Sprites
+	which draw on their own "image" instead of replacing it should set their
+	"dirty" attribute to True after doing so. (See board_game.Statusbar).
+
+	Each frame, the old and new rects of the dirty sprites are merged where they
+	overlap. Only those areas are cleared, and only the parts of sprites which
+	overlap those areas are redrawn. The list of areas returned by "draw()" is
+	passed to pygame.display.update(), so only these are updated on the display.
+
+	Use this group by setting the "dirty_rendering" option of the Game.
+	"""
+
+	def __init__(self, *sprites, **kwargs):
+		SleepingUpdates.__init__(self, *sprites, **kwargs)
+		self._drawn = {}			# (rect, image) of each sprite when it was last drawn
+		self._lost = []				# Rects of sprites removed since the last draw
+		self._background = None
+		self._invalid = False		# When True, redraw the whole surface
+
+	def remove_internal(self, sprite):
+		drawn = self._drawn.pop(sprite, None)
+		if drawn is not None:
+			self._lost.append(drawn[0])
+		SleepingUpdates.remove_internal(self, sprite)
+
+	def invalidate(self):
+		"""
+		Causes the whole surface to be redrawn on the next call to "draw()".
+		"""
+		self._invalid = True
+
+	def clear(self, surface, bgd):
+		"""
+		Sets the background to clear dirty areas with. The actual clearing is done
+		in "draw()", once the dirty areas are known.
+		"""
+		self._background = bgd
+
+	def draw(self, surface, bgsurf = None, special_flags = 0):
+		"""
+		Clears and redraws the areas of the surface covered by dirty sprites.
+		Returns a list of the areas which were redrawn.
+		"""
+		sprites = self.sprites()
+		drawn = self._drawn
+		dirty = self._lost
+		self._lost = []
+		self.lostsprites = []
+		if self._invalid:
+			self._invalid = False
+			dirty.append(surface.get_rect())
+		for sprite in sprites:
+			rect, image = sprite.rect, sprite.image
+			last = drawn.get(sprite)
+			if last is None:
+				dirty.append(rect.copy())
+			elif last[0] != rect or last[1] is not image:
+				dirty.append(last[0].union(rect))
+			elif getattr(sprite, "dirty", False):
+				dirty.append(rect.copy())
+			else:
+				continue
+			drawn[sprite] = (rect.copy(), image)
+			sprite.dirty = False
+		if not dirty:
+			return dirty
+		bounds = surface.get_rect()
+		dirty = [ rect.clip(bounds) for rect in merge_rects(dirty) ]
+		background = self._background if bgsurf is None else bgsurf
+		if background is not None:
+			for rect in dirty:
+				surface.blit(background, rect, rect)
+		for sprite in sprites:
+			rect = sprite.rect
+			for index in rect.collidelistall(dirty):
+				area = rect.clip(dirty[index])
+				surface.blit(sprite.image, area, area.move(-rect.x, -rect.y), special_flags)
+		return dirty
+
+
+#  end legame/sprite_groups.py
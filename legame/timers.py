@@ -0,0 +1,179 @@
+#  legame/timers.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+"""
+Provides the TimerQueue class, which the Game class uses to run the callbacks set
+using "set_timeout()" and "set_interval()".
+"""
+import logging
+from heapq import heappush, heappop, heapify
+from itertools import count
+
+# Timer handles are never reused, so that clearing a timer which has already
+# fired cannot clear some other timer which was set later.
+_handles = count(1)
+
+
+def new_handle():
+	"""
+	Returns a timer handle which is not used by any timer. Used to mark the point in
+	the sequence of handles where a recording started; see replay.Recording.
+	"""
+	return next(_handles)
+
+# Indexes of the members of a timer entry:
+_DUE, _HANDLE, _CALLBACK, _ARGUMENTS, _INTERVAL = range(5)
+
+
+class TimerQueue:
+	"""
+	A set of timers kept in a heap, ordered by the time each is due. There is no
+	limit to the number of timers. Setting and clearing a timer are O(log n).
+
+	The units of time are up to the caller. The Game class keeps one TimerQueue
+	measured in milliseconds of its "game_time", and another measured in frames.
+	"""
+
+	def __init__(self):
+		self._heap = []
+		self._timers = {}		# Live timer entries, keyed on handle
+
+	def __len__(self):
+		"""
+		Returns the number of timers which are set.
+		"""
+		return len(self._timers)
+
+	def add(self, due, callback, arguments, interval = None):
+		"""
+		Sets a timer which calls "callback" at time "due". If "interval" is given, the
+		timer repeats every "interval" after that, until cleared.
+
+		Returns an (integer) handle identifying the timer, which can be passed to
+		"cancel()".
+		"""
+		handle = next(_handles)
+		entry = [due, handle, callback, arguments, interval]
+		self._timers[handle] = entry
+		heappush(self._heap, entry)
+		return handle
+
+	def cancel(self, handle):
+		"""
+		Clears the timer identified by "handle". Returns True if the timer was set,
+		False if it had already fired or been cleared.
+
+		The entry is marked as cancelled and left in the heap, to be discarded when it
+		comes due, or when the heap is compacted by "run()".
+		"""
+		entry = self._timers.pop(handle, None)
+		if entry is None:
+			return False
+		entry[_CALLBACK] = None
+		return True
+
+	def next_due(self):
+		"""
+		Returns the time the next timer is due, or None if no timers are set.
+		"""
+		while self._heap and self._heap[0][_CALLBACK] is None:
+			heappop(self._heap)
+		return self._heap[0][_DUE] if self._heap else None
+
+	def run(self, now):
+		"""
+		Calls the callback of every timer which is due at time "now", in the order
+		that they came due. Repeating timers are set to run again; the others are
+		cleared before their callback is called.
+
+		Timers set by a callback are not run until the next call to this function,
+		even if they are already due.
+
+		Returns a list of the handles of the timers which fired.
+		"""
+		if len(self._heap) > 2 * len(self._timers) + 64:
+			self._compact()
+		heap = self._heap
+		due = []
+		while heap and heap[0][_DUE] <= now:
+			entry = heappop(heap)
+			if entry[_CALLBACK] is not None:
+				due.append(entry)
+		fired = []
+		for entry in due:
+			if entry[_CALLBACK] is None:
+				continue		# Cleared by the callback of an earlier timer
+			callback, arguments = entry[_CALLBACK], entry[_ARGUMENTS]
+			if entry[_INTERVAL]:
+				entry[_DUE] += entry[_INTERVAL]
+				if entry[_DUE] <= now:
+					entry[_DUE] = now + entry[_INTERVAL]	# Fell behind; don't try to catch up
+				heappush(heap, entry)
+			else:
+				del self._timers[entry[_HANDLE]]
+			fired.append(entry[_HANDLE])
+			if arguments:
+				callback(arguments)
+			else:
+				callback()
+		return fired
+
+	def fire(self, handles):
+		"""
+		Calls the callback of each of the timers identified by "handles", in the order
+		given, regardless of when they are due. Used when replaying a recording, in
+		place of "run()". Repeating timers remain set; the others are cleared.
+
+		Returns a list of the handles of the timers which fired.
+		"""
+		fired = []
+		for handle in handles:
+			entry = self._timers.get(handle)
+			if entry is None:
+				logging.warning("Timer %d is not set; replay is out of step with the recording", handle)
+				continue
+			callback, arguments = entry[_CALLBACK], entry[_ARGUMENTS]
+			if not entry[_INTERVAL]:
+				self.cancel(handle)
+			fired.append(handle)
+			if arguments:
+				callback(arguments)
+			else:
+				callback()
+		return fired
+
+	def clear(self):
+		"""
+		Clears all timers.
+		"""
+		for entry in self._timers.values():
+			entry[_CALLBACK] = None
+		self._heap.clear()
+		self._timers.clear()
+
+	def _compact(self):
+		"""
+		Removes cancelled entries from the heap. Only safe to call when no timers have
+		been popped from the heap to be run.
+		"""
+		self._heap = list(self._timers.values())
+		heapify(self._heap)
+
+
+#  end legame/timers.py
@@ -0,0 +1,81 @@
+#  legame/tests/batch_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import random, time
+from pygame import Surface
+from legame.game import Game, GameState
+from legame.batch import run_one, run_batch
+
+
+class SimGame(Game):
+	quiet = True
+	speed = 1
+	def initial_background(self, display_size):
+		return Surface((40, 40))
+	def initial_state(self):
+		self.total = 0
+		return GSSim()
+	def metrics(self):
+		return { "total": self.total }
+
+
+class GSSim(GameState):
+	def loop_end(self):
+		self.game.total += self.game.speed * random.randrange(10)
+
+
+class TimedGame(SimGame):
+	delay = 0.0
+	def initial_state(self):
+		self.fired = None
+		self.set_timeout(self.timeout, 250)
+		return GSSlow()
+	def timeout(self):
+		self.fired = self.frame_count
+	def metrics(self):
+		return { "fired": self.fired }
+
+
+class GSSlow(GameState):
+	def loop_end(self):
+		time.sleep(self.game.delay)
+
+
+def test_run_one():
+	first = run_one((SimGame, 20, 7, {}))
+	assert first["frames"] == 20
+	assert first["seed"] == 7
+	assert run_one((SimGame, 20, 7, {}))["metrics"] == first["metrics"]
+	doubled = run_one((SimGame, 20, 7, { "speed": 2 }))
+	assert doubled["metrics"]["total"] == 2 * first["metrics"]["total"]
+
+def test_run_batch():
+	results = run_batch(SimGame, [ { "seed": 1 }, { "seed": 2, "speed": 3 } ], frames = 10, processes = 2)
+	assert [ result["seed"] for result in results ] == [1, 2]
+	assert results[1]["attributes"] == { "speed": 3 }
+	assert results[0]["metrics"] == run_one((SimGame, 10, 1, {}))["metrics"]
+
+def test_timers_reproducible():
+	first = run_one((TimedGame, 30, 3, {}))
+	assert first["metrics"]["fired"] is not None
+	assert run_one((TimedGame, 30, 3, {}))["metrics"] == first["metrics"]
+	assert run_one((TimedGame, 30, 3, { "delay": 0.02 }))["metrics"] == first["metrics"]
+
+
+#  end legame/tests/batch_test.py
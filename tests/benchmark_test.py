@@ -0,0 +1,51 @@
+#  legame/tests/benchmark_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import pytest
+from pygame import Surface
+from legame.game import Game
+from legame.benchmark import load_game_class, benchmark, compare
+
+
+class BenchGame(Game):
+	quiet = True
+	def initial_background(self, display_size):
+		return Surface((120, 80))
+
+
+def test_load_game_class():
+	assert load_game_class("legame.game:Game") is Game
+	with pytest.raises(ValueError):
+		load_game_class("legame.game")
+
+def test_benchmark():
+	result = benchmark(BenchGame, 25)
+	assert result["game"] == "BenchGame"
+	assert result["frames"] == 25
+	assert result["fps"] > 0
+	assert isinstance(Game.current, BenchGame)
+	assert Game.current.headless
+	assert Game.current.screen.get_size() == (120, 80)
+
+def test_compare():
+	assert compare({ "fps": 95.0 }, { "fps": 100.0 }, 0.1) == (0.95, True)
+	assert compare({ "fps": 80.0 }, { "fps": 100.0 }, 0.1) == (0.8, False)
+
+
+#  end legame/tests/benchmark_test.py
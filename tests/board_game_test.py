@@ -19,7 +19,9 @@
 #
 import pytest
 from pygame import Rect
-from legame.board_game import BoardGame, GameBoard, AbstractGamePiece, Cell
+from legame.board_game import BoardGame, GameBoard, AbstractGamePiece, GamePiece, Cell
+from legame.flipper import Flipper, FlipThrough, FlipNone
+from legame.resources import Resources
 from legame.game import Game
 
 @pytest.fixture(autouse = True)
@@ -334,6 +336,51 @@ def test_game_piece_travel():
 	assert piece.target_cell.column == 5
 	assert piece.target_cell.row == 4
 
+def test_cell_board():
+	first = FakeGame()
+	second = FakeGame()
+	second.board.left = 100
+	cell = first.board.cell_at(60, 60)
+	assert cell.board is first.board
+	assert cell.center() == (75, 75)
+	assert cell.shifted(columns = 1).board is first.board
+	assert Cell(1, 1).board is second.board
+	assert Cell(1, 1).center() == (175, 75)
+
+
+class FlippingPiece(GamePiece, Flipper):
+	def __init__(self, cell, color):
+		self.image_folder = "FlippingPiece/" + color
+		GamePiece.__init__(self, cell, color)
+		Flipper.__init__(self, FlipThrough("enter"), FlipNone())
+	def update(self):
+		GamePiece.update(self)
+		Flipper.update(self)
+
+
+def test_flipping_piece_sleep(tmp_path):
+	for path in ("FlippingPiece/r/0.png", "FlippingPiece/r/enter/0.png", "FlippingPiece/r/enter/1.png"):
+		path = tmp_path / "images" / path
+		path.parent.mkdir(parents = True, exist_ok = True)
+		path.touch()
+	game = FakeGame()
+	game.resources = Resources(str(tmp_path), True)
+	piece = FlippingPiece(Cell(1, 1), "r")
+	assert not piece.sleeping
+	assert piece in game.sprites.awake_sprites()
+	for frame in range(4):
+		piece.update()
+	assert piece.flipper is None
+	assert piece.sleeping
+	piece.move_to(column = 3)
+	assert not piece.sleeping
+	for frame in range(50):
+		piece.update()
+	assert piece.cell == Cell(3, 1)
+	assert piece.sleeping
+	piece.flip(FlipThrough("enter"))
+	assert not piece.sleeping
+
 
 if __name__ == "__main__":
 	test_game_piece_travel()
@@ -0,0 +1,82 @@
+#  legame/tests/camera_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+from pygame import Rect, Surface
+from pygame.sprite import Sprite
+from legame.camera import Camera, CameraUpdates
+from legame.sprite_enhancement import CenteredSprite
+
+
+class Block(CenteredSprite, Sprite):
+	def __init__(self, group, x, y):
+		CenteredSprite.__init__(self, x, y)
+		Sprite.__init__(self, group)
+		self.image = Surface(self.rect.size)
+		self.image.fill((255, 0, 0))
+
+
+def test_camera():
+	camera = Camera(Rect(0, 0, 1000, 1000), (100, 100))
+	assert camera.rect == Rect(0, 0, 100, 100)
+	camera.look_at((500, 500))
+	assert camera.rect.center == (500, 500)
+	assert camera.to_screen((500, 500)) == (50, 50)
+	assert camera.to_world((50, 50)) == (500, 500)
+	camera.look_at((990, 10))
+	assert camera.rect == Rect(900, 0, 100, 100)
+	assert camera.sees(Rect(950, 50, 10, 10))
+	assert not camera.sees(Rect(850, 50, 10, 10))
+
+def test_follow():
+	camera = Camera(Rect(0, 0, 1000, 1000), (100, 100))
+	target = CenteredSprite(300, 400)
+	camera.follow(target)
+	camera.update()
+	assert camera.rect.center == (300, 400)
+
+def test_culling():
+	camera = Camera(Rect(0, 0, 1000, 1000), (100, 100))
+	group = CameraUpdates(camera)
+	near = Block(group, 520, 520)
+	far = Block(group, 50, 50)
+	screen = Surface((100, 100))
+	background = Surface((100, 100))
+	camera.look_at((500, 500))
+	group.clear(screen, background)
+	assert group.draw(screen) == [Rect(0, 0, 100, 100)]
+	assert screen.get_at((70, 70)) == (255, 0, 0)
+	assert screen.get_at((5, 5)) == (0, 0, 0)
+	assert near.rect.center == (520, 520)
+	assert far.position.x == 50
+	group.clear(screen, background)
+	assert group.draw(screen) == [Rect(65, 65, 10, 10), Rect(65, 65, 10, 10)]
+
+def test_screen_layers():
+	camera = Camera(Rect(0, 0, 1000, 1000), (100, 100))
+	group = CameraUpdates(camera, screen_layers = (7,))
+	overlay = Block(group, 10, 10)
+	group.change_layer(overlay, 7)
+	screen = Surface((100, 100))
+	camera.look_at((500, 500))
+	group.clear(screen, Surface((100, 100)))
+	group.draw(screen)
+	assert screen.get_at((10, 10)) == (255, 0, 0)
+
+
+#  end legame/tests/camera_test.py
@@ -0,0 +1,83 @@
+#  legame/tests/capture_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import os
+import pygame
+from pygame import Rect, Surface
+from legame.capture import FrameCapture
+
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+
+
+def draw_frames(capture, screen):
+	"""
+	Draws five frames, each changing one 10x10 square, and captures only the
+	changed square, except for the first frame.
+	"""
+	screen.fill(BLUE)
+	capture.capture(screen)
+	for frame in range(1, 5):
+		rect = Rect(frame * 10, 0, 10, 10)
+		screen.fill(RED if frame % 2 else GREEN, rect)
+		capture.capture(screen, [rect])
+
+
+def test_dump_png(tmp_path):
+	capture = FrameCapture(str(tmp_path), 3)
+	screen = Surface((50, 20))
+	draw_frames(capture, screen)
+	assert len(capture) == 3
+	directory = capture.dump()
+	capture.close()
+	assert sorted(os.listdir(directory)) == [ "frame00000.png", "frame00001.png", "frame00002.png" ]
+	first = pygame.image.load(os.path.join(directory, "frame00000.png"))
+	assert first.get_at((15, 5))[:3] == RED			# Drawn before the buffer began
+	assert first.get_at((25, 5))[:3] == GREEN
+	assert first.get_at((35, 5))[:3] == BLUE		# Not drawn yet
+	last = pygame.image.load(os.path.join(directory, "frame00002.png"))
+	assert last.get_at((45, 5))[:3] == GREEN
+	assert last.get_at((5, 15))[:3] == BLUE
+
+def test_dump_raw(tmp_path):
+	capture = FrameCapture(str(tmp_path), 10, "raw")
+	screen = Surface((50, 20))
+	draw_frames(capture, screen)
+	first = capture.dump()
+	second = capture.dump()
+	capture.close()
+	assert first != second
+	for directory in (first, second):
+		assert os.path.getsize(os.path.join(directory, "frames.rgb")) == 5 * 50 * 20 * 3
+
+def test_start_stop(tmp_path):
+	capture = FrameCapture(str(tmp_path), 2)
+	screen = Surface((50, 20))
+	directory = capture.start()
+	draw_frames(capture, screen)
+	capture.stop()
+	capture.capture(screen)
+	capture.close()
+	assert len(os.listdir(directory)) == 5
+	last = pygame.image.load(os.path.join(directory, "frame00004.png"))
+	assert last.get_at((15, 5))[:3] == RED
+
+
+#  end legame/tests/capture_test.py
@@ -0,0 +1,391 @@
+#  legame/tests/game_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import os, pytest, threading, asyncio, time
+import pygame
+from concurrent.futures import wait
+from pygame import Surface
+from pygame.sprite import Sprite
+from legame.game import Game, GameState
+from legame.sprite_enhancement import MovingSprite
+
+@pytest.fixture(autouse = True)
+def game():
+	game = FakeGame()
+	game.show()
+	return game
+
+
+class FakeGame(Game):
+	headless	= True
+	quiet		= True
+	def initial_background(self, display_size):
+		return Surface((100, 100))
+	def initial_state(self):
+		return GSKeys()
+
+
+class GSKeys(GameState):
+	def key_down(self, event):
+		pass
+
+
+class GSMouse(GameState):
+	def mouse_motion(self, event):
+		pass
+
+
+def test_event_blocking(game):
+	game._enter_initial_state()
+	assert not pygame.event.get_blocked(pygame.KEYDOWN)
+	assert pygame.event.get_blocked(pygame.MOUSEMOTION)
+	assert pygame.event.get_blocked(pygame.JOYAXISMOTION)
+	assert not pygame.event.get_blocked(pygame.QUIT)
+	assert not pygame.event.get_blocked(pygame.USEREVENT)
+	game._state = GSMouse()
+	game._filter_events()
+	assert pygame.event.get_blocked(pygame.KEYDOWN)
+	assert not pygame.event.get_blocked(pygame.MOUSEMOTION)
+
+def test_event_blocking_disabled(game):
+	game.block_unhandled_events = False
+	pygame.event.set_allowed(None)
+	game._enter_initial_state()
+	assert not pygame.event.get_blocked(pygame.MOUSEMOTION)
+
+def test_frame_timers(game):
+	game._enter_initial_state()
+	fired = []
+	game.set_frame_timeout(lambda: fired.append(game.frame_count), 3)
+	handle = game.set_frame_interval(lambda: fired.append(game.frame_count), 2)
+	game.max_frames = 8
+	game.limit_fps = False
+	game._main_loop()
+	assert fired == [2, 3, 4, 6]
+	game.clear_timeout(handle)
+	game.clear_timeout(handle)
+
+def test_timeout(game):
+	game._enter_initial_state()
+	fired = []
+	game.set_timeout(fired.append, 0, key = "value")
+	game.max_frames = 1
+	game.limit_fps = False
+	game._main_loop()
+	assert fired == [{ "key": "value" }]
+
+def test_timeout_game_time(game):
+	game._enter_initial_state()
+	fired = []
+	game.set_timeout(lambda: fired.append(game.frame_count), 90)
+	game._state.loop_end = lambda: time.sleep(0.01)
+	game.fps = 30
+	game.max_frames = 6
+	game.limit_fps = False
+	game._main_loop()
+	assert fired == [3]
+	assert game.game_time == pytest.approx(6 * 1000 / 30)
+
+def test_hud(game):
+	game.hud_key = pygame.K_F3
+	game._enter_initial_state()
+	game._state = GSMouse()
+	game._filter_events()
+	assert not pygame.event.get_blocked(pygame.KEYDOWN)
+	game._evt_keydown(pygame.event.Event(pygame.KEYDOWN, key = pygame.K_F3))
+	assert game.hud in game.sprites
+	assert game.sprites.get_layer_of_sprite(game.hud) == Game.LAYER_OVERLAY
+	game.hud.refresh_ms = 0
+	game.set_interval(lambda: None, 1000)
+	game.max_frames = 3
+	game.limit_fps = False
+	game._main_loop()
+	assert len(game.hud._frame_times) == game.hud.graph_width
+	hud = game.hud
+	game.toggle_hud()
+	assert game.hud is None
+	assert not hud.alive()
+
+
+def test_hidden_window(game):
+	game.hidden_render = False
+	game.hidden_fps = 5
+	game._enter_initial_state()
+	assert not pygame.event.get_blocked(pygame.WINDOWMINIMIZED)
+	assert pygame.event.get_blocked(pygame.WINDOWFOCUSLOST)
+	sprite = pygame.sprite.Sprite(game.sprites)
+	sprite.image = Surface((10, 10))
+	sprite.image.fill((255, 0, 0))
+	sprite.rect = sprite.image.get_rect()
+	game._evt_windowminimized(pygame.event.Event(pygame.WINDOWMINIMIZED))
+	game._evt_windowhidden(pygame.event.Event(pygame.WINDOWHIDDEN))
+	assert game.window_hidden
+	game.max_frames = 1
+	game.limit_fps = False
+	game._main_loop()
+	assert game.screen.get_at((5, 5)) == (0, 0, 0)
+	game._evt_windowrestored(pygame.event.Event(pygame.WINDOWRESTORED))
+	assert game.window_hidden
+	game._evt_windowshown(pygame.event.Event(pygame.WINDOWSHOWN))
+	assert not game.window_hidden
+	game.max_frames = 2
+	game._stay_in_loop = True
+	game._main_loop()
+	assert game.screen.get_at((5, 5)) == (255, 0, 0)
+
+
+class GSWorker(GameState):
+	def enter_state(self):
+		self.results = []
+		self.release = threading.Event()
+		self.submit(self.done, sum, (1, 2, 3))
+	def done(self, future):
+		self.results.append(future.result())
+		self.submit(self.results.append, self.release.wait)
+		GSDone()
+
+
+class GSDone(GameState):
+	def enter_state(self):
+		Game.current._stay_in_loop = False
+
+
+def test_submit(game):
+	game.initial_state = GSWorker
+	game._enter_initial_state()
+	state = game._state
+	game.limit_fps = False
+	game._main_loop()
+	state.release.set()
+	assert state.results == [6]
+	assert game._tasks == {}
+
+
+class GSAsync(GameState):
+	async def enter_state(self):
+		self.log = ["entered"]
+		await asyncio.sleep(0)
+		pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key = pygame.K_a))
+	async def key_down(self, event):
+		await asyncio.sleep(0)
+		self.log.append(event.key)
+
+
+def test_run_async(game):
+	game.max_frames = 10
+	game.limit_fps = False
+	state = GSAsync()
+	game.initial_state = lambda: state
+	assert game.run_async() == 0
+	assert game.frame_count == 10
+	assert state.log == ["entered", pygame.K_a]
+	assert game._coroutines == {}
+
+def test_coroutine_requires_run_async(game):
+	game.initial_state = GSAsync
+	with pytest.raises(RuntimeError):
+		game._enter_initial_state()
+
+
+class GSLoaded(GameState):
+	def __init__(self, release):
+		self.release = release
+		GameState.__init__(self)
+	def preload(self):
+		return [ self.release.wait, lambda: None ]
+
+
+def test_preload(game):
+	game._enter_initial_state()
+	first = game._state
+	release = threading.Event()
+	loaded = GSLoaded(release)
+	wait(game._preloads[1:])
+	game.limit_fps = False
+	game.max_frames = 3
+	game._main_loop()
+	assert game._state is first
+	assert game.loading_progress == 0.5
+	release.set()
+	wait(game._preloads)
+	game.max_frames = 4
+	game._stay_in_loop = True
+	game._main_loop()
+	assert game._state is loaded
+	assert game.loading_progress is None
+
+
+class GSCounting(GameState):
+	def enter_state(self):
+		self.frames = 0
+	def loop_end(self):
+		assert Game.current is self.game
+		self.frames += 1
+
+
+class CountingGame(FakeGame):
+	def initial_state(self):
+		return GSCounting(game = self)
+
+
+def test_step(game):
+	first, second = CountingGame(), CountingGame()
+	Game.current = game
+	assert first.step(3)
+	assert second.step()
+	assert first.step()
+	assert Game.current is game
+	assert first._state.game is first and second._state.game is second
+	assert first._state.frames == 4 and first.frame_count == 4
+	assert second._state.frames == 1 and second.frame_count == 1
+	second.max_frames = 2
+	assert not second.step(5)
+	assert second.frame_count == 2
+	assert not second.step()
+
+def test_step_frame_time():
+	for stepped in (True, False):
+		game = CountingGame()
+		game.fixed_timestep = True
+		game.fps = 60
+		game.steps_per_second = 120
+		game.limit_fps = False
+		game.max_frames = 60
+		updates = []
+		game.sprites.update = lambda: updates.append(game.frame_count)
+		if stepped:
+			game.step(60)
+		else:
+			game.show()
+			game._enter_initial_state()
+			game._main_loop()
+		assert game.game_time == pytest.approx(1000.0)
+		assert len(updates) == 119		# One on the first frame, then two per frame
+		assert updates.count(10) == 2
+
+class Mover(MovingSprite, Sprite):
+	def __init__(self, group):
+		MovingSprite.__init__(self, 0.0, 0.0, speed = 4, direction = 0)
+		Sprite.__init__(self, group)
+		self.image = Surface((2, 2))
+		self.rect = self.image.get_rect(center = (0, 0))
+
+
+def run_timed_frames(game, frame_times):
+	"""
+	Runs a frame for each of "frame_times", (in milliseconds, after the first),
+	returning the number of updates and the interpolation alpha of each frame.
+	"""
+	updates = []
+	update = game.sprites.update
+	game.sprites.update = lambda: (updates.append(game.frame_count), update())
+	results = []
+	with game.activated():
+		game._enter_initial_state()
+		game._start_loop()
+		for frame_ms in (None,) + tuple(frame_times):
+			if frame_ms is not None:
+				game._end_frame(frame_ms)
+			game._run_frame()
+			results.append((updates.count(game.frame_count - 1), game.interpolation_alpha))
+	return results
+
+def fixed_game():
+	game = FakeGame()
+	game.show()
+	game.fixed_timestep = True
+	game.fps = 50
+	game.steps_per_second = 100			# 10 milliseconds per step
+	game.limit_fps = True
+	game.max_steps_per_frame = 5
+	return game
+
+def test_fixed_timestep():
+	game = fixed_game()
+	results = run_timed_frames(game, (25.0, 15.0, 3.0, 4.0))
+	assert [ steps for steps, alpha in results ] == [ 1, 2, 2, 0, 0 ]
+	assert [ alpha for steps, alpha in results ] == \
+		pytest.approx([ 0.0, 0.5, 0.0, 0.3, 0.7 ])
+
+def test_fixed_timestep_backlog():
+	game = fixed_game()
+	results = run_timed_frames(game, (87.0, 20.0))
+	assert results[1][0] == 5			# Capped at "max_steps_per_frame"
+	assert results[1][1] == pytest.approx(0.7)	# 37 ms left over; whole steps dropped
+	assert results[2][0] == 2
+	assert results[2][1] == pytest.approx(0.7)
+	assert game._lag == pytest.approx(7.0)
+
+def test_interpolate_motion():
+	game = fixed_game()
+	mover = Mover(game.sprites)
+	run_timed_frames(game, (25.0,))
+	assert mover.x == pytest.approx(12.0)			# Three steps
+	assert mover.previous_position == pytest.approx((8.0, 0.0))
+	assert mover.rect.centerx == 10				# Half way through the third step
+
+def test_user_events(game):
+	received = []
+	game._enter_initial_state()
+	game._state.user_event = received.append
+	game._state.key_down = received.append
+	game.max_frames = 1
+	game.limit_fps = False
+	pygame.event.post(pygame.event.Event(pygame.USEREVENT + 3, code = 7))
+	pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key = pygame.K_a))
+	game._main_loop()
+	assert [ event.type for event in received ] == [ pygame.USEREVENT + 3, pygame.KEYDOWN ]
+
+class TracedGame(FakeGame):
+	trace_startup	= True
+	subsystems		= ("font",)
+
+
+def test_trace_startup():
+	pygame.quit()
+	game = TracedGame()
+	assert game.step()
+	assert [ step for step, milliseconds in game.startup_times ] == \
+		[ "options", "pygame", "init", "show", "initial_state", "first_frame" ]
+	times = [ milliseconds for step, milliseconds in game.startup_times ]
+	assert times == sorted(times)
+	assert pygame.font.get_init()
+	assert not pygame.mixer.get_init()
+
+def test_capture(game, tmp_path):
+	game.capture_seconds = 0.05
+	game.capture_dir = str(tmp_path)
+	game.capture_key = pygame.K_F12
+	game.__init__()
+	game.max_frames = 4
+	game.limit_fps = False
+	game.show()
+	game._enter_initial_state()
+	game._main_loop()
+	assert len(game.capture) == 3
+	game.max_frames = 5
+	game._stay_in_loop = True
+	pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key = pygame.K_F12))
+	game._main_loop()
+	directories = os.listdir(tmp_path)
+	assert len(directories) == 1
+	assert len(os.listdir(tmp_path / directories[0])) == 3
+
+
+#  end legame/tests/game_test.py
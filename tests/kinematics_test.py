@@ -0,0 +1,78 @@
+#  legame/tests/kinematics_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import math, pytest
+from legame import triangular
+from legame.kinematics import stopping_frames, stopping_distance, arrival_frames, braking_decel
+
+
+def recursive_triangular(remainder, reduction):
+	"""
+	The recursive calculation which stopping_distance() replaced.
+	"""
+	if remainder <= reduction:
+		return reduction
+	return remainder + recursive_triangular(remainder - reduction, reduction)
+
+def simulated_arrival(distance, speed, accel, max_speed):
+	frames = 0
+	while distance > 0:
+		speed = min(max_speed, speed + accel)
+		distance -= speed
+		frames += 1
+	return frames
+
+
+def test_stopping_distance():
+	for speed, decel in ((0.0, 1.0), (1.0, 1.0), (3.0, 1.0), (10.0, 1.4), (17.0, 1.4),
+		(5.5, 2.0), (100.0, 3.0), (0.25, 1.0), (-2.0, 1.0)):
+		assert stopping_distance(speed, decel) == pytest.approx(recursive_triangular(speed + decel, decel))
+		assert triangular(speed, decel) == stopping_distance(speed, decel)
+	assert stopping_frames(10.0, 1.4) == 8
+	assert stopping_frames(-1.0, 1.0) == 0
+	# Would exceed the recursion limit when calculated recursively:
+	assert stopping_distance(100000.0, 0.01) == pytest.approx(100000.0 ** 2 / 0.02, rel = 1e-3)
+
+def test_arrival_frames():
+	for distance, speed, accel, max_speed in ((100.0, 0.0, 1.0, 17.0), (100.0, 2.0, 0.5, 5.0),
+		(10.0, 1.0, 0.0, 17.0), (1000.0, 0.5, 1.4, 17.0), (3.0, 20.0, 1.0, 17.0), (55.0, 0.0, 1.0, 100.0)):
+		assert arrival_frames(distance, speed, accel, max_speed) == \
+			simulated_arrival(distance, speed, accel, max_speed)
+	assert arrival_frames(100.0, 0.0, 1.0) == simulated_arrival(100.0, 0.0, 1.0, math.inf) == 14
+	assert arrival_frames(0.0, 0.0) == 0
+	assert arrival_frames(1.0, 0.0) == math.inf
+
+def test_braking_decel():
+	assert braking_decel(10.0, 50.0) == 1.0
+	assert braking_decel(10.0, 0.0) == math.inf
+
+def test_arrays():
+	np = pytest.importorskip("numpy")
+	from legame.kinematics import stopping_distance_array, arrival_frames_array, braking_decel_array
+	speeds = np.array([0.0, 3.0, 10.0, 17.0])
+	assert stopping_distance_array(speeds, 1.4) == pytest.approx(
+		[ stopping_distance(speed, 1.4) for speed in speeds ])
+	cases = np.array([(100.0, 0.0, 1.0, 17.0), (100.0, 2.0, 0.5, 5.0), (10.0, 1.0, 0.0, 17.0),
+		(3.0, 20.0, 1.0, 17.0), (0.0, 1.0, 1.0, 1.0), (1.0, 0.0, 0.0, 1.0), (100.0, 0.0, 1.0, math.inf)])
+	assert arrival_frames_array(*cases.T).tolist() == \
+		[ arrival_frames(*case) for case in cases.tolist() ]
+	assert braking_decel_array([10.0, 10.0], [50.0, 0.0]).tolist() == [1.0, math.inf]
+
+
+#  end legame/tests/kinematics_test.py
@@ -0,0 +1,219 @@
+#  legame/tests/motion_engine_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import pytest
+pytest.importorskip("numpy")
+from pygame import Surface
+from pygame.sprite import Sprite, Group
+from pygame.math import Vector2 as Vector
+from legame.sprite_enhancement import MovingSprite
+from legame.motion_engine import MotionEngine, ArrayMovingSprite
+from legame.pool import SpritePool, Pooled
+from legame.game import Game, GameState
+
+
+class Thing(ArrayMovingSprite, Sprite):
+	def __init__(self, engine, *args):
+		ArrayMovingSprite.__init__(self, *args, engine = engine)
+		Sprite.__init__(self)
+
+
+class PooledThing(Pooled, Thing):
+	def reset(self, engine, *args):
+		self.reset_motion(*args)
+
+
+class PlainThing(MovingSprite, Sprite):
+	def __init__(self, *args):
+		MovingSprite.__init__(self, *args)
+		Sprite.__init__(self)
+
+
+def step(engine, sprites, frames):
+	for frame in range(frames):
+		for sprite in sprites:
+			sprite.update()
+		engine.step()
+
+
+def test_same_as_moving_sprite():
+	engine = MotionEngine(2)
+	things = [ Thing(engine, 10.0, 20.0, 3.0, 30.0), Thing(engine, 50.0, 50.0, 1.5, -100.0),
+		Thing(engine, 0.0, 0.0) ]
+	plain = [ PlainThing(10.0, 20.0, 3.0, 30.0), PlainThing(50.0, 50.0, 1.5, -100.0),
+		PlainThing(0.0, 0.0) ]
+	assert engine.capacity == 4
+	things[2].travel_to((40.0, 30.0))
+	plain[2].travel_to((40.0, 30.0))
+	for frame in range(60):
+		step(engine, things, 1)
+		for sprite in plain:
+			sprite.update()
+		for thing, sprite in zip(things, plain):
+			assert tuple(thing.position) == pytest.approx(tuple(sprite.position))
+			assert thing.rect == sprite.rect
+	assert things[2].speed == 0.0
+	assert things[0].direction == pytest.approx(30.0)
+
+def test_properties():
+	engine = MotionEngine()
+	thing = Thing(engine, 5.0, 5.0)
+	thing.x = 7.0
+	thing.speed = 2.0
+	thing.direction = 90.0
+	assert tuple(engine.positions[0]) == (7.0, 5.0)
+	assert engine.motions[0] == pytest.approx((0.0, 2.0))
+	assert Vector(10, 10) - thing.position == Vector(3, 5)
+	thing.position += Vector(1, 1)
+	assert thing.position == Vector(8, 6)
+
+def test_kill_and_reuse():
+	engine = MotionEngine()
+	pool = SpritePool(PooledThing)
+	group = Group()
+	first = pool.acquire(engine, 0.0, 0.0, 1.0, 0.0)
+	second = pool.acquire(engine, 100.0, 0.0, 1.0, 180.0)
+	group.add(first, second)
+	step(engine, group, 10)
+	first.kill()
+	assert len(engine) == 1 and second._engine_index == 0
+	assert first.position == Vector(10, 0)
+	step(engine, group, 10)
+	assert first.position == Vector(10, 0)
+	assert second.position == Vector(80, 0)
+	assert pool.acquire(engine, 5.0, 5.0, 2.0, 90.0) is first
+	assert len(engine) == 2
+	step(engine, group, 1)
+	assert first.position == Vector(5, 7)
+	assert first.rect.center == (5, 7)
+
+def test_batched_seek():
+	engine = MotionEngine()
+	targets = [ (200.0, 10.0), (40.0, 40.0), (0.0, 90.0), (300.0, 300.0) ]
+	things = [ Thing(engine, 0.0, 0.0) for target in targets ]
+	plain = [ PlainThing(0.0, 0.0) for target in targets ]
+	arrivals = []
+	for index in (2, 0, 3, 1):
+		things[index].travel_to(targets[index], lambda index = index: arrivals.append(index))
+		plain[index].travel_to(targets[index])
+	things[0].decel_rate = plain[0].decel_rate = 2.5
+	engine.refresh_limits(things[0])
+	while len(arrivals) < len(things):
+		step(engine, things, 1)
+		for sprite in plain:
+			sprite.update()
+		for thing, sprite in zip(things, plain):
+			assert tuple(thing.position) == pytest.approx(tuple(sprite.position))
+			assert thing.rect == sprite.rect
+	assert sorted(arrivals) == [0, 1, 2, 3]
+	assert [ tuple(thing.position) for thing in things ] == targets
+	assert not engine.seeking.any()
+
+def test_arrival_order():
+	engine = MotionEngine()
+	things = [ Thing(engine, 0.0, 0.0) for n in range(3) ]
+	arrivals = []
+	def arrived(index):
+		arrivals.append(index)
+		if index == 1:
+			things[1].kill()
+			things[0].travel_to((0.0, 0.0), lambda: arrivals.append(0))
+	for index in (2, 1, 0):
+		things[index].travel_to((10.0, 0.0), lambda index = index: arrived(index))
+	step(engine, things, 20)
+	assert arrivals == [2, 1, 0, 0]
+	assert things[0].position == Vector(0, 0)
+	assert things[1].position == Vector(10, 0)
+
+def test_seek_not_batched():
+	class Seeker(Thing):
+		def seek_motion(self):
+			self.sought = True
+			return super().seek_motion()
+	engine = MotionEngine()
+	seeker = Seeker(engine, 0.0, 0.0).travel_to((100.0, 0.0))
+	thing = Thing(engine, 0.0, 0.0).travel_to((100.0, 0.0))
+	assert engine.seeking.tolist()[:2] == [False, True]
+	step(engine, [seeker, thing], 1)
+	assert seeker.sought
+	assert seeker.position == thing.position
+	thing.reset_motion(5.0, 5.0)
+	step(engine, [thing], 1)
+	assert thing.position == Vector(5, 5)
+
+def test_group_removal():
+	engine = MotionEngine()
+	first, second = Group(), Group()
+	thing = Thing(engine, 0.0, 0.0, 1.0, 0.0)
+	other = Thing(engine, 0.0, 0.0, 1.0, 90.0)
+	first.add(thing, other)
+	second.add(thing)
+	first.remove(thing)
+	assert len(engine) == 2
+	second.empty()
+	first.empty()
+	assert len(engine) == 0
+	engine.step()
+	assert thing.position == Vector(0, 0)
+	second.add(thing)
+	assert len(engine) == 1
+	engine.step()
+	assert thing.position == Vector(1, 0)
+	assert thing.rect.center == (1, 0)
+	thing.kill()
+	assert len(engine) == 0
+
+def test_limit_speeds():
+	engine = MotionEngine()
+	engine.limit_speeds = True
+	thing = Thing(engine, 0.0, 0.0, 500.0, 0.0)
+	engine.step()
+	assert thing.x == pytest.approx(thing.max_speed)
+
+class EngineGame(Game):
+	headless			= True
+	quiet				= True
+	use_motion_engine	= True
+	limit_fps			= False
+	max_frames			= 10
+	def initial_background(self, display_size):
+		return Surface((100, 100))
+	def initial_state(self):
+		return GameState()
+
+
+class GameThing(ArrayMovingSprite, Sprite):
+	def __init__(self, *args):
+		ArrayMovingSprite.__init__(self, *args)
+		Sprite.__init__(self, Game.current.sprites)
+		self.image = Surface((self.width, self.height))
+
+
+def test_game():
+	game = EngineGame()
+	game.show()
+	thing = GameThing(10.0, 10.0, 2.0, 0.0)
+	game._enter_initial_state()
+	game._main_loop()
+	assert game.motion_engine._sprites == [thing]
+	assert thing.position == Vector(30, 10)
+	assert thing.rect.center == (30, 10)
+
+
+#  end legame/tests/motion_engine_test.py
@@ -0,0 +1,85 @@
+#  legame/tests/pacing_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+from pygame import Rect
+from pygame.sprite import Sprite
+from legame.pacing import FramePacer
+from legame.neighbors import Neighborhood
+from legame.sprite_groups import SleepingUpdates
+
+
+class Settings:
+	detail = "high"
+
+
+def run(pacer, cost_ms, frames):
+	for frame in range(frames):
+		pacer.update(cost_ms)
+
+
+def test_degrade_and_restore():
+	pacer = FramePacer(50)		# 20 ms budget
+	calls = []
+	pacer.add(lambda: calls.append("degrade 1"), lambda: calls.append("restore 1"))
+	pacer.add_attribute(Settings, "detail", "low")
+	assert len(pacer) == 2
+	run(pacer, 15, 100)
+	assert pacer.level == 0
+	run(pacer, 25, pacer.sample_frames // 2 + 1)		# Average now over 20 ms
+	assert pacer.level == 1 and calls == ["degrade 1"]
+	run(pacer, 25, pacer.settle_frames + pacer.sample_frames - 1)
+	assert pacer.level == 1
+	run(pacer, 25, 1)
+	assert pacer.level == 2 and Settings.detail == "low"
+	run(pacer, 25, 200)
+	assert pacer.level == 2
+	run(pacer, 5, pacer.settle_frames + pacer.sample_frames)
+	assert pacer.level == 1 and Settings.detail == "high"
+	run(pacer, 5, pacer.settle_frames + pacer.sample_frames)
+	assert pacer.level == 0 and calls == ["degrade 1", "restore 1"]
+
+def test_restore_all():
+	pacer = FramePacer(50)
+	group = SleepingUpdates()
+	sprite = Sprite()
+	group.add(sprite, layer = 3)
+	pacer.add_layer(group, 3)
+	run(pacer, 30, pacer.sample_frames)
+	assert pacer.level == 1
+	assert group.awake_sprites() == []
+	pacer.restore_all()
+	assert pacer.level == 0
+	assert group.awake_sprites() == [sprite]
+
+def test_notify_interval():
+	neighborhood = Neighborhood(Rect(0, 0, 100, 100), 10, 10)
+	noticed = []
+	class Thing:
+		x, y = 5, 5
+		def notice(self, neighbor):
+			noticed.append(neighbor)
+	neighborhood.observe(Thing())
+	neighborhood.observe(Thing())
+	neighborhood.notify_interval = 3
+	for call in range(6):
+		neighborhood.notify_sprites()
+	assert len(noticed) == 4
+
+
+#  end legame/tests/pacing_test.py
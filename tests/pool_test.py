@@ -0,0 +1,111 @@
+#  legame/tests/pool_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import pytest
+from pygame import Rect
+from pygame.sprite import Sprite, Group, LayeredUpdates
+from legame.sprite_enhancement import MovingSprite
+from legame.neighbors import Neighborhood, Neighbor
+from legame.pool import SpritePool, Pooled
+
+
+class Bullet(Pooled, MovingSprite, Neighbor, Sprite):
+	def __init__(self, groups, neighborhood, x, y, speed, direction):
+		MovingSprite.__init__(self, x, y, speed, direction)
+		Sprite.__init__(self, *groups)
+		groups[0].change_layer(self, 3)
+		neighborhood.observe(self)
+	def reset(self, groups, neighborhood, x, y, speed, direction):
+		self.reset_motion(x, y, speed, direction)
+	def notice(self, neighbor):
+		pass
+
+
+def test_pool():
+	layered, plain = LayeredUpdates(), Group()
+	neighborhood = Neighborhood(Rect(0, 0, 400, 300), 4, 3)
+	pool = SpritePool(Bullet, neighborhood)
+	groups = (layered, plain)
+
+	bullet = pool.acquire(groups, neighborhood, 10.0, 20.0, 5.0, 0.0)
+	assert bullet.pool is pool
+	assert len(pool) == 0
+	rect = bullet.rect
+	bullet.travel_to((100.0, 100.0))
+	bullet.update()
+
+	bullet.kill()
+	assert len(pool) == 1
+	assert not bullet.alive()
+	assert not neighborhood.is_observing(bullet)
+	bullet.kill()			# Killing twice does not release twice
+	assert len(pool) == 1
+
+	again = pool.acquire(groups, neighborhood, 50.0, 60.0, 2.0, 90.0)
+	assert again is bullet
+	assert len(pool) == 0
+	assert again.rect is rect
+	assert again.position == (50.0, 60.0)
+	assert again.rect.center == (50, 60)
+	assert again.speed == 2.0
+	assert round(again.direction) == 90
+	assert again.destination is None
+	assert layered.has(again) and plain.has(again)
+	assert layered.get_layer_of_sprite(again) == 3
+	assert neighborhood.is_observing(again)
+
+	# A new sprite is created when the pool is empty:
+	other = pool.acquire(groups, neighborhood, 0.0, 0.0, 0.0, 0.0)
+	assert other is not again
+
+
+def test_limit():
+	neighborhood = Neighborhood(Rect(0, 0, 400, 300), 4, 3)
+	pool = SpritePool(Bullet, limit = 1)
+	bullets = [ pool.acquire((LayeredUpdates(),), neighborhood, 0.0, 0.0, 1.0, 0.0) for i in range(3) ]
+	for bullet in bullets:
+		bullet.kill()
+	assert len(pool) == 1
+
+class Spark(Pooled, MovingSprite, Sprite):
+	def __init__(self, x, y, speed, direction):
+		MovingSprite.__init__(self, x, y, speed, direction)
+		Sprite.__init__(self)
+
+
+class Thing(Pooled, Sprite):
+	pass
+
+
+def test_default_reset():
+	pool = SpritePool(Spark)
+	spark = pool.acquire(10.0, 10.0, 3.0, 0.0)
+	spark.travel_to((100.0, 100.0))
+	spark.kill()
+	assert pool.acquire(20.0, 30.0, 2.0, 90.0) is spark
+	assert spark.position == (20.0, 30.0)
+	assert tuple(spark.motion) == pytest.approx((0.0, 2.0))
+	assert spark._motion_function == spark.cartesian_motion
+	with pytest.raises(TypeError):
+		SpritePool(Thing)
+	with pytest.raises(TypeError):
+		SpritePool(MovingSprite)
+
+
+#  end legame/tests/pool_test.py
@@ -0,0 +1,70 @@
+#  legame/tests/profiler_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import csv, json
+from legame.profiler import FrameProfiler
+
+
+def fill(profiler, count):
+	for frame in range(count):
+		for phase in profiler.phases:
+			profiler.samples[phase].append(float(frame + 1))
+
+def test_lap():
+	profiler = FrameProfiler(10)
+	profiler.start()
+	for phase in profiler.phases:
+		profiler.lap(phase)
+	for phase in profiler.phases:
+		assert len(profiler.samples[phase]) == 1
+		assert profiler.samples[phase][0] >= 0.0
+
+def test_rolling_window():
+	profiler = FrameProfiler(10)
+	fill(profiler, 25)
+	assert len(profiler.samples["draw"]) == 10
+	assert profiler.samples["draw"][0] == 16.0
+
+def test_percentiles():
+	profiler = FrameProfiler(100)
+	assert profiler.percentiles("update") == {}
+	fill(profiler, 100)
+	pct = profiler.percentiles("update")
+	assert pct["p50"] == 50.0
+	assert pct["p95"] == 95.0
+	assert pct["p99"] == 99.0
+
+def test_dump(tmp_path):
+	profiler = FrameProfiler(20)
+	fill(profiler, 20)
+	filename = str(tmp_path / "profile.csv")
+	profiler.dump(filename)
+	with open(filename) as fh:
+		rows = list(csv.reader(fh))
+	assert rows[0] == list(profiler.phases)
+	assert len(rows) == 21
+	filename = str(tmp_path / "profile.json")
+	profiler.dump(filename)
+	with open(filename) as fh:
+		data = json.load(fh)
+	assert data["frames"] == 20
+	assert data["percentiles"]["display"]["p50"] == 10.0
+
+
+#  end legame/tests/profiler_test.py
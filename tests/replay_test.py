@@ -0,0 +1,98 @@
+#  legame/tests/replay_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+import random, gzip, pytest
+import pygame
+from pygame import Surface
+from legame.game import Game, GameState
+from legame.replay import Recording
+
+
+class RecordedGame(Game):
+	quiet		= True
+	headless	= True
+	limit_fps	= False
+	max_frames	= 10
+	def initial_background(self, display_size):
+		return Surface((100, 100))
+	def initial_state(self):
+		return GSRecorded()
+
+
+class GSRecorded(GameState):
+	def enter_state(self):
+		self.log = []
+	def loop_start(self):
+		if Game.current.frame_count in (2, 5):
+			Game.current.set_timeout(self.tick, 0)
+		if Game.current.frame_count == 3 and not Game.current._replaying:
+			pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key = pygame.K_a))
+	def key_down(self, event):
+		self.log.append(("key", Game.current.frame_count, event.key))
+	def tick(self):
+		self.log.append(("timer", Game.current.frame_count, random.randrange(1000)))
+
+
+def play(**attributes):
+	game = type("RecordedGame", (RecordedGame,), attributes)()
+	game.show()
+	game._enter_initial_state()
+	state = game._state
+	game._main_loop()
+	return game, state.log
+
+
+def test_record_and_replay(tmp_path):
+	filename = str(tmp_path / "session.replay")
+	game, recorded = play(record_file = filename)
+	assert len(recorded) == 3
+	assert ("key", 3, pygame.K_a) in recorded
+	recording = Recording.load(filename)
+	assert len(recording) == 10
+	assert recording.seed == game.random_seed
+
+	game, replayed = play(replay_file = filename, max_frames = None)
+	assert game.headless
+	assert game.frame_count == 10
+	assert replayed == recorded
+
+def test_load_attributes(tmp_path):
+	filename = str(tmp_path / "session.replay")
+	recording = Recording(1, 100)
+	recording.record([ pygame.event.Event(pygame.MOUSEMOTION, pos = (3, 4), window = object()) ],
+		[ 102 ], 16.5)
+	recording.save(filename)
+	events, timers, milliseconds = Recording.load(filename).play(200)
+	assert events[0].type == pygame.MOUSEMOTION
+	assert events[0].dict == { "pos" : (3, 4) }
+	assert timers == [ 202 ]
+	assert milliseconds == 16.5
+
+def test_load_rejects(tmp_path):
+	filename = str(tmp_path / "session.replay")
+	Recording(1, 100).save(filename)
+	with pytest.raises(ValueError):
+		Recording.load(filename)
+	with gzip.open(filename, "wb") as fh:
+		fh.write(b"\x80\x05not json")
+	with pytest.raises(ValueError):
+		Recording.load(filename)
+
+
+#  end legame/tests/replay_test.py
@@ -0,0 +1,91 @@
+#  legame/tests/rotation_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+from pygame import Surface, Rect
+from pygame.sprite import Sprite
+from legame.sprite_enhancement import MovingSprite
+from legame.rotation import RotationCache, Rotating
+
+RED = (255, 0, 0)
+
+
+def arrow():
+	"""
+	Returns a 20x10 image, red on the right half, pointing to the right.
+	"""
+	image = Surface((20, 10))
+	image.fill(RED, Rect(10, 0, 10, 10))
+	return image
+
+
+def test_rotated():
+	cache = RotationCache(step = 5)
+	image = arrow()
+	down = cache.rotated(image, 91.0)
+	assert down.get_size() == (10, 20)
+	assert down.get_at((5, 15))[:3] == RED			# Pointing down, as MovingSprite directions
+	assert cache.rotated(image, 89.0) is down
+	assert cache.rotated(image, -270.0) is down
+	assert cache.rotated(image, 450.0) is down
+	assert cache.rotated(image, -90.0).get_at((5, 5))[:3] == RED
+	assert (cache.hits, cache.misses) == (3, 2)
+	assert cache.rotated(arrow(), 90.0) is not down
+
+def test_limit():
+	cache = RotationCache(step = 90, limit = 3)
+	image = arrow()
+	cache.preload(image)
+	assert len(cache) == 3
+	first = cache.rotated(image, 90.0)		# Evicts 180
+	cache.rotated(image, 0.0)				# Evicted by preload
+	assert cache.rotated(image, 90.0) is first
+	cache.rotated(image, 180.0)
+	assert cache.misses == 6
+	cache.clear()
+	assert len(cache) == 0
+
+
+class Arrow(Rotating, MovingSprite, Sprite):
+
+	width		= 20
+	height		= 10
+	base_image	= arrow()
+
+	def __init__(self, *args):
+		MovingSprite.__init__(self, *args)
+		Sprite.__init__(self)
+
+	def update(self):
+		MovingSprite.update(self)
+		self.rotate_image()
+
+
+def test_rotating():
+	sprite = Arrow(50.0, 50.0)
+	sprite.direction = 90.0
+	sprite.update()
+	assert sprite.rect.size == (10, 20)
+	assert sprite.rect.center == (50, 50)
+	sprite.direction = 0.0
+	sprite.update()
+	assert sprite.rect.size == (20, 10)
+	assert sprite.rect.center == (50, 50)
+
+
+#  end legame/tests/rotation_test.py
@@ -17,8 +17,9 @@
 #  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
 #  MA 02110-1301, USA.
 #
+import pytest
 from pygame import Rect
-from legame.sprite_enhancement import MovingSprite, BoxedInSprite
+from legame.sprite_enhancement import MovingSprite, CompactMovingSprite, BoxedInSprite, to_vector
 from pygame.math import Vector2 as Vector
 from legame import	normal_degrees, \
 					DEGREES_EAST, DEGREES_NORTH, DEGREES_NORTHWEST, \
@@ -67,6 +68,32 @@ def test_basic_move():
 	assert thing1.x == 100
 	assert thing1.direction == 0.0
 
+def test_interpolate():
+	thing = MovingSprite(x = 100, y = 100, speed = 10, direction = DEGREES_EAST)
+	thing.interpolate(0.5)
+	assert thing.rect.centerx == 100
+	thing.remember_position()
+	thing.cartesian_motion()
+	thing.interpolate(0.5)
+	assert thing.x == 110
+	assert thing.rect.centerx == 105
+	thing.interpolate(1.0)
+	assert thing.rect.centerx == 110
+	thing.interpolate(0.0)
+	assert thing.rect.centerx == 100
+	assert thing.rect.centery == 100
+
+def test_interpolate_shift():
+	thing = MovingSprite(x = 100, y = 100, speed = 10, direction = DEGREES_EAST)
+	thing.remember_position()
+	thing.shift_position(0, 40)
+	thing.cartesian_motion()
+	thing.interpolate(0.5)
+	assert thing.rect.center == (105, 120)
+	thing.reset_motion(0, 0)
+	thing.interpolate(0.5)
+	assert thing.rect.center == (0, 0)
+
 def test_vector_copy():
 	thing1 = MovingSprite(100, 100)
 	thing2 = MovingSprite(0, 0)
@@ -203,5 +230,24 @@ def test_turn_towards():
 	assert abs(subject.turning_speed) == subject.max_turning_speed
 	assert abs(subject.direction) == abs(subject.direction)
 
+def test_compact():
+	compact = CompactMovingSprite(10.0, 20.0, 3.0, 45.0)
+	plain = MovingSprite(10.0, 20.0, 3.0, 45.0)
+	assert not hasattr(compact, "__dict__")
+	with pytest.raises(AttributeError):
+		compact.anything = 1
+	compact.travel_to((100.0, 50.0))
+	plain.travel_to(Vector(100.0, 50.0))
+	for frame in range(100):
+		compact.update()
+		plain.update()
+		assert compact.position == plain.position
+		assert compact.rect == plain.rect
+	assert compact.speed == 0.0
+	compact.turn_towards(to_vector(plain))
+	compact.reset_motion(1.0, 2.0, 1.0, 0.0)
+	compact.update()
+	assert compact.position == Vector(2.0, 2.0)
+
 
 #  end legame/tests/sprite_enhancement_test.py
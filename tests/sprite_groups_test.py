@@ -0,0 +1,118 @@
+#  legame/tests/sprite_groups_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+from pygame import Rect, Surface
+from pygame.sprite import Sprite
+from legame.sprite_groups import SleepingUpdates, DirtyUpdates, merge_rects, sleep, wake
+from legame.sprite_enhancement import MovingSprite
+
+
+class Block(Sprite):
+	def __init__(self, group, x, y, color = (255, 0, 0)):
+		Sprite.__init__(self, group)
+		self.image = Surface((10, 10))
+		self.image.fill(color)
+		self.rect = self.image.get_rect(topleft = (x, y))
+
+
+def draw(group, screen, background):
+	group.clear(screen, background)
+	return group.draw(screen)
+
+def test_merge_rects():
+	merged = merge_rects([Rect(0, 0, 10, 10), Rect(50, 50, 10, 10), Rect(5, 5, 10, 10)])
+	assert len(merged) == 2
+	assert Rect(0, 0, 15, 15) in merged
+	assert Rect(50, 50, 10, 10) in merged
+	merged = merge_rects([Rect(0, 0, 10, 10), Rect(20, 0, 10, 10), Rect(5, 0, 20, 10)])
+	assert merged == [Rect(0, 0, 30, 10)]
+
+def test_draw_only_changes():
+	screen = Surface((100, 100))
+	background = Surface((100, 100))
+	group = DirtyUpdates()
+	still = Block(group, 10, 10)
+	moving = Block(group, 50, 50, (0, 255, 0))
+	assert len(draw(group, screen, background)) == 2
+	assert screen.get_at((15, 15)) == (255, 0, 0)
+	assert draw(group, screen, background) == []
+	moving.rect.move_ip(5, 0)
+	assert draw(group, screen, background) == [Rect(50, 50, 15, 10)]
+	assert screen.get_at((52, 55)) == (0, 0, 0)
+	assert screen.get_at((62, 55)) == (0, 255, 0)
+	still.image.fill((0, 0, 255))
+	assert draw(group, screen, background) == []
+	still.dirty = True
+	assert draw(group, screen, background) == [Rect(10, 10, 10, 10)]
+	assert screen.get_at((15, 15)) == (0, 0, 255)
+	still.kill()
+	assert draw(group, screen, background) == [Rect(10, 10, 10, 10)]
+	assert screen.get_at((15, 15)) == (0, 0, 0)
+	group.invalidate()
+	assert draw(group, screen, background) == [Rect(0, 0, 100, 100)]
+
+class Mover(MovingSprite, Sprite):
+	def __init__(self, group, layer):
+		MovingSprite.__init__(self, 10.0, 10.0)
+		Sprite.__init__(self)
+		group.add(self, layer = layer)
+		self.updates = 0
+	def update(self):
+		self.updates += 1
+		MovingSprite.update(self)
+
+
+def test_sleeping():
+	group = SleepingUpdates()
+	piece = Mover(group, 6)
+	background = Mover(group, 1)
+	group.update()
+	sleep(piece)
+	group.sleep_layer(1)
+	group.update()
+	assert piece.updates == 1 and background.updates == 1
+	assert group.awake_sprites() == []
+	assert len(group.sprites()) == 2
+	piece.travel_to((50.0, 50.0))
+	assert not piece.sleeping
+	group.update()
+	assert piece.updates == 2
+	group.change_layer(piece, 1)
+	group.update()
+	assert piece.updates == 2
+	group.wake_layer(1)
+	wake(background)
+	group.update()
+	assert piece.updates == 3 and background.updates == 2
+
+def test_overlapping_redraw():
+	screen = Surface((100, 100))
+	background = Surface((100, 100))
+	group = DirtyUpdates()
+	under = Block(group, 10, 10)
+	over = Block(group, 15, 10, (0, 255, 0))
+	group.change_layer(over, 2)
+	draw(group, screen, background)
+	under.rect.move_ip(0, 2)
+	draw(group, screen, background)
+	assert screen.get_at((17, 15)) == (0, 255, 0)
+	assert screen.get_at((12, 15)) == (255, 0, 0)
+
+
+#  end legame/tests/sprite_groups_test.py
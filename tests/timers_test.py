@@ -0,0 +1,103 @@
+#  legame/tests/timers_test.py
+#
+#  Copyright 2020 - 2025 Leon Dionne <ldionne@dridesign.sh.cn>
+#
+#  This program is free software; you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation; either version 2 of the License, or
+#  (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software
+#  Foundation, Inc., 51 Franklin Street, Fifth Floor, Boston,
+#  MA 02110-1301, USA.
+#
+from legame.timers import TimerQueue
+
+
+def test_order():
+	queue = TimerQueue()
+	fired = []
+	for due in [30, 10, 20]:
+		queue.add(due, fired.append, due)
+	assert len(queue) == 3
+	assert queue.next_due() == 10
+	queue.run(5)
+	assert fired == []
+	queue.run(25)
+	assert fired == [10, 20]
+	queue.run(30)
+	assert fired == [10, 20, 30]
+	assert len(queue) == 0
+	assert queue.next_due() is None
+
+def test_interval():
+	queue = TimerQueue()
+	fired = []
+	handle = queue.add(10, lambda: fired.append(1), None, 10)
+	for now in range(0, 55, 5):
+		queue.run(now)
+	assert len(fired) == 5
+	assert queue.cancel(handle)
+	queue.run(100)
+	assert len(fired) == 5
+
+def test_cancel():
+	queue = TimerQueue()
+	fired = []
+	handle = queue.add(10, fired.append, "a")
+	assert queue.cancel(handle)
+	assert not queue.cancel(handle)
+	queue.run(10)
+	assert fired == []
+
+def test_handles_not_reused():
+	queue = TimerQueue()
+	fired = []
+	first = queue.add(10, fired.append, "first")
+	queue.run(10)
+	second = queue.add(20, fired.append, "second")
+	assert first != second
+	assert not queue.cancel(first)
+	queue.run(20)
+	assert fired == ["first", "second"]
+
+def test_cancel_from_callback():
+	queue = TimerQueue()
+	fired = []
+	handles = {}
+	handles["b"] = queue.add(10, fired.append, "b")
+	queue.add(5, lambda: queue.cancel(handles["b"]), None)
+	queue.run(10)
+	assert fired == []
+
+def test_set_from_callback():
+	queue = TimerQueue()
+	fired = []
+	def again():
+		fired.append(len(fired))
+		queue.add(0, again, None)
+	queue.add(0, again, None)
+	queue.run(0)
+	assert fired == [0]
+	queue.run(0)
+	assert fired == [0, 1]
+
+def test_many_timers():
+	queue = TimerQueue()
+	fired = []
+	handles = [ queue.add(due, fired.append, due) for due in range(5000, 0, -1) ]
+	for handle in handles[::2]:
+		queue.cancel(handle)
+	assert len(queue) == 2500
+	queue.run(5000)
+	assert len(fired) == 2500
+	assert fired == sorted(fired)
+
+
+#  end legame/tests/timers_test.py